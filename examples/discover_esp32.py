@@ -5,111 +5,464 @@ Scans the network for ESP32 devices and displays their information.
 """
 
 import socket
+import selectors
 import json
 import time
+import sys
+import threading
+import ctypes
+import ctypes.util
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Tuple, Dict, Any, Optional
 from pathlib import Path
 
+from python_client import maybe_ip, mdns_query
 
-# Cache file for last known IP
+# Use orjson for decoding replies when installed, else the standard library
+try:
+    import orjson as _json
+
+    _loads = _json.loads
+except ImportError:
+    _loads = json.loads
+
+# Use zeroconf for direct mDNS service discovery when installed
+try:
+    from zeroconf import Zeroconf, ServiceBrowser
+except ImportError:
+    Zeroconf = None
+
+
+# Cache file for known devices and the time of the last broadcast scan
 CACHE_FILE = Path.home() / ".esp32_last_ip"
 
+# Maximum number of devices remembered in the cache
+CACHE_MAX_DEVICES = 16
 
-def save_ip(ip: str):
-    """Save the last successful IP address to cache file."""
-    try:
-        with open(CACHE_FILE, 'w') as f:
-            f.write(ip)
-    except Exception:
-        pass
+# Skip the broadcast if one ran this recently and a cached device answers
+BROADCAST_DEBOUNCE = 30.0
+
+# mDNS service advertised by the firmware
+MDNS_SERVICE_TYPE = "_esp32._udp.local."
 
+# Encoded STATUS probe sent to cached devices and by the broadcast scan
+_STATUS_CMD = b'{"cmd":"STATUS"}'
 
-def load_cached_ip() -> Optional[str]:
-    """Load the last successful IP address from cache file."""
+
+def load_cache() -> Dict[str, Any]:
+    """Load the cache file as {"devices": [...], "last_broadcast_ts": float}."""
+    cache = {"devices": [], "last_broadcast_ts": 0.0}
     try:
         if CACHE_FILE.exists():
             with open(CACHE_FILE, 'r') as f:
-                ip = f.read().strip()
-                if ip:
-                    return ip
+                text = f.read().strip()
+            if not text:
+                return cache
+            try:
+                data = json.loads(text)
+            except ValueError:
+                # Older cache files hold a single bare IP
+                cache["devices"] = [{"ip": text, "mac": None, "last_seen": 0.0}]
+                return cache
+            if isinstance(data, dict):
+                cache["last_broadcast_ts"] = float(data.get("last_broadcast_ts", 0.0))
+                data = data.get("devices", [])
+            # Older cache files hold just the device list
+            if isinstance(data, list):
+                cache["devices"] = [r for r in data if isinstance(r, dict) and r.get("ip")]
     except Exception:
         pass
-    return None
+    return cache
+
+
+def save_devices(entries: List[Tuple[str, Optional[str]]], broadcast: bool = False):
+    """Record (ip, mac) pairs as just seen, evicting the least recently seen.
 
+    Pass broadcast=True when the entries come from a broadcast scan so the
+    next run can skip scanning again.
+    """
+    now = time.time()
+    fresh = [{"ip": ip, "mac": mac, "last_seen": now} for ip, mac in entries]
+    seen_ips = {r["ip"] for r in fresh}
+    seen_macs = {r["mac"] for r in fresh if r["mac"]}
+
+    cache = load_cache()
+    records = fresh + [r for r in cache["devices"]
+                       if r["ip"] not in seen_ips and
+                       not (r.get("mac") and r["mac"] in seen_macs)]
+    records.sort(key=lambda r: r.get("last_seen", 0.0), reverse=True)
 
-def test_ip(ip: str, udp_port: int = 8889, timeout: float = 1.0) -> bool:
-    """Test if an IP address responds to STATUS command."""
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({"devices": records[:CACHE_MAX_DEVICES],
+                       "last_broadcast_ts": now if broadcast else cache["last_broadcast_ts"]}, f)
+    except Exception:
+        pass
+
+
+def status_mac(response: Dict[str, Any]) -> Optional[str]:
+    """Return the MAC address from a STATUS reply, or None if it has none."""
+    wifi = response.get("wifi")
+    return wifi.get("mac") if isinstance(wifi, dict) else None
+
 
-        status_cmd = json.dumps({"cmd": "STATUS"})
-        sock.sendto(status_cmd.encode(), (ip, udp_port))
+def probe_cached_devices(devices: List[Dict[str, Any]], udp_port: int = 8889,
+                         timeout: float = 0.3) -> List[str]:
+    """
+    Probe all cached devices at once and return the IPs that respond.
 
-        data, addr = sock.recvfrom(4096)
+    Every probe goes out from one socket and the replies are collected
+    together, so the whole check takes at most one timeout.
+    """
+    ips = [d["ip"] for d in devices]
+    if not ips:
+        return []
+
+    answered = set()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    try:
+        for ip in ips:
+            try:
+                sock.sendto(_STATUS_CMD, (ip, udp_port))
+            except OSError:
+                continue  # Unresolvable or unreachable entry
+
+        deadline = time.monotonic() + timeout
+        while len(answered) < len(ips):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(timeout=remaining):
+                break
+            for data, addr in recvmmsg_batch(sock):
+                try:
+                    if _loads(data).get("success", False):
+                        answered.add(addr[0])
+                except (ValueError, AttributeError):
+                    continue
+    finally:
+        sel.close()
         sock.close()
 
-        response = json.loads(data.decode())
-        return response.get("success", False)
+    return [ip for ip in ips if ip in answered]
+
+
+# Linux recvmmsg(2)/sendmmsg(2) bindings, used to move many discovery
+# datagrams per syscall
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [("sin_family", ctypes.c_ushort),
+                ("sin_port", ctypes.c_uint16),
+                ("sin_addr", ctypes.c_ubyte * 4),
+                ("sin_zero", ctypes.c_ubyte * 8)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IOVec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
 
-    except Exception:
-        return False
 
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr),
+                ("msg_len", ctypes.c_uint)]
 
-def discover_mdns(hostname: str = "esp32-controller.local", timeout: float = 2.0) -> str:
-    """Try to resolve ESP32 using mDNS."""
+
+_MSG_DONTWAIT = 0x40
+
+
+def _load_mmsg_fn(name: str, argtypes: list):
+    """Return the named libc function, or None where it is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
     try:
-        socket.setdefaulttimeout(timeout)
-        ip = socket.gethostbyname(hostname)
-        return ip
-    except:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                           use_errno=True)
+        fn = getattr(libc, name)
+    except (OSError, AttributeError):
         return None
-    finally:
-        socket.setdefaulttimeout(None)
+    fn.argtypes = argtypes
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_recvmmsg = _load_mmsg_fn("recvmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr),
+                                       ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])
+_sendmmsg = _load_mmsg_fn("sendmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr),
+                                       ctypes.c_uint, ctypes.c_int])
+
+
+# Each thread gets its own receive buffers: the kernel writes payloads and
+# source addresses into them, so they can't be shared between threads
+_mmsg_local = threading.local()
+
+
+def _mmsg_buffers(n: int, bufsize: int):
+    """Return this thread's mmsghdr array and backing buffers, allocating on first use."""
+    cache = _mmsg_local.__dict__.setdefault("buffers", {})
+    if (n, bufsize) not in cache:
+        cache[(n, bufsize)] = _alloc_mmsg_buffers(n, bufsize)
+    return cache[(n, bufsize)]
+
+
+def _alloc_mmsg_buffers(n: int, bufsize: int):
+    """Allocate an mmsghdr array and its backing buffers."""
+    msgs = (_MMsgHdr * n)()
+    iovs = (_IOVec * n)()
+    addrs = (_SockAddrIn * n)()
+    bufs = [ctypes.create_string_buffer(bufsize) for _ in range(n)]
+    for i in range(n):
+        iovs[i].iov_base = ctypes.cast(bufs[i], ctypes.c_void_p)
+        iovs[i].iov_len = bufsize
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = ctypes.cast(ctypes.pointer(addrs[i]), ctypes.c_void_p)
+        hdr.msg_iov = ctypes.pointer(iovs[i])
+        hdr.msg_iovlen = 1
+    return msgs, addrs, bufs
+
+
+def recvmmsg_batch(sock: socket.socket, n: int = 32, bufsize: int = 4096) -> List[Tuple[bytes, Tuple[str, int]]]:
+    """
+    Receive up to n pending datagrams from a non-blocking UDP socket.
+
+    Uses a single recvmmsg(2) call on Linux; elsewhere falls back to
+    calling recvfrom until the socket would block.
+    Returns a list of (data, (ip, port)) tuples, empty if nothing is queued.
+    """
+    if _recvmmsg is None:
+        packets = []
+        while len(packets) < n:
+            try:
+                packets.append(sock.recvfrom(bufsize))
+            except OSError:
+                break
+        return packets
+
+    msgs, addrs, bufs = _mmsg_buffers(n, bufsize)
+    for i in range(n):
+        # The kernel overwrites namelen with the actual address size
+        msgs[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+
+    count = _recvmmsg(sock.fileno(), msgs, n, _MSG_DONTWAIT, None)
+    if count < 0:
+        return []
+
+    packets = []
+    for i in range(count):
+        addr = addrs[i]
+        ip = socket.inet_ntoa(bytes(addr.sin_addr))
+        port = socket.ntohs(addr.sin_port)
+        packets.append((bufs[i].raw[:msgs[i].msg_len], (ip, port)))
+    return packets
+
+
+def sendmmsg_copies(sock: socket.socket, data: bytes, addr: Tuple[str, int], count: int = 3):
+    """
+    Send count copies of one datagram to addr.
+
+    Uses a single sendmmsg(2) call on Linux; elsewhere (or for any copies
+    the kernel didn't accept) falls back to calling sendto.
+    """
+    sent = 0
+    if _sendmmsg is not None:
+        host, port = addr
+        dest = _SockAddrIn()
+        dest.sin_family = socket.AF_INET
+        dest.sin_port = socket.htons(port)
+        ip = ("255.255.255.255" if host == "<broadcast>"
+              else maybe_ip(host) or socket.gethostbyname(host))
+        dest.sin_addr[:] = socket.inet_aton(ip)
+
+        # Every message shares the same payload and destination
+        buf = ctypes.create_string_buffer(data, len(data))
+        iov = _IOVec(ctypes.cast(buf, ctypes.c_void_p), len(data))
+        msgs = (_MMsgHdr * count)()
+        for i in range(count):
+            hdr = msgs[i].msg_hdr
+            hdr.msg_name = ctypes.cast(ctypes.pointer(dest), ctypes.c_void_p)
+            hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+            hdr.msg_iov = ctypes.pointer(iov)
+            hdr.msg_iovlen = 1
+
+        sent = max(0, _sendmmsg(sock.fileno(), msgs, count, 0))
+
+    for _ in range(count - sent):
+        sock.sendto(data, addr)
+
+
+class _MDNSListener:
+    """Collects device IPs announced by a zeroconf ServiceBrowser."""
+
+    def __init__(self, timeout: float):
+        self._ips: List[str] = []
+        self._timeout_ms = int(timeout * 1000)
+        self._lock = threading.Lock()
+        self.resolved = threading.Event()  # Set once an address is found
+
+    def found(self) -> List[str]:
+        with self._lock:
+            return list(self._ips)
+
+    def add_service(self, zc, type_: str, name: str):
+        info = zc.get_service_info(type_, name, timeout=self._timeout_ms)
+        if info:
+            with self._lock:
+                for ip in info.parsed_addresses():
+                    if ip not in self._ips and ':' not in ip:
+                        self._ips.append(ip)
+                        self.resolved.set()
+
+    def update_service(self, zc, type_: str, name: str):
+        pass
+
+    def remove_service(self, zc, type_: str, name: str):
+        pass
 
 
-def discover_udp_broadcast(udp_port: int = 8889, timeout: float = 3.0) -> List[Tuple[str, Dict[str, Any]]]:
-    """Discover ESP32 devices using UDP broadcast."""
-    devices = []
+def discover_mdns(hostname: str = "esp32-controller.local", timeout: float = 2.0) -> List[str]:
+    """
+    Find ESP32 devices using mDNS.
+
+    With zeroconf installed, browses for the firmware's service;
+    otherwise multicasts an A query for hostname. Either way the answer
+    comes straight from the device, not through the OS resolver.
+    Returns the IPs found (possibly empty).
+    """
+    if maybe_ip(hostname):
+        return [hostname]  # Already an address: nothing to look up
+
+    if Zeroconf is not None:
+        zc = None
+        try:
+            zc = Zeroconf()
+            listener = _MDNSListener(timeout)
+            ServiceBrowser(zc, MDNS_SERVICE_TYPE, listener)
+            # Resolving a service can take a while: wait for the first
+            # address rather than a fixed browse time
+            listener.resolved.wait(timeout)
+            return listener.found()
+        except Exception:
+            return []
+        finally:
+            if zc is not None:
+                zc.close()
 
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.settimeout(0.5)
+        ip = mdns_query(hostname, timeout)
+    except OSError:
+        return []
+    return [ip] if ip else []
 
-        # Broadcast STATUS command
-        status_cmd = json.dumps({"cmd": "STATUS"})
-        broadcast_addr = ('<broadcast>', udp_port)
 
-        # Send multiple broadcasts
-        for _ in range(3):
-            sock.sendto(status_cmd.encode(), broadcast_addr)
-            time.sleep(0.1)
+class ScanStop:
+    """
+    Cancellation flag for discover_udp_broadcast.
 
-        # Collect responses
-        start_time = time.time()
-        discovered_ips = set()
+    Works like threading.Event, but set() also wakes a scan that is
+    blocked waiting for replies, so cancelling needs no polling.
+    """
 
-        while time.time() - start_time < timeout:
-            try:
-                data, addr = sock.recvfrom(4096)
-                ip = addr[0]
+    def __init__(self):
+        self._event = threading.Event()
+        self._wake_r, self._wake_w = socket.socketpair()
 
-                if ip in discovered_ips:
-                    continue
+    def set(self):
+        self._event.set()
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:
+            pass
 
-                discovered_ips.add(ip)
-                response = json.loads(data.decode())
+    def is_set(self) -> bool:
+        return self._event.is_set()
 
-                if response.get("success"):
-                    devices.append((ip, response))
+    def fileno(self) -> int:
+        return self._wake_r.fileno()
 
-            except socket.timeout:
-                continue
-            except:
-                continue
+    def close(self):
+        self._wake_r.close()
+        self._wake_w.close()
 
-        sock.close()
+
+def discover_udp_broadcast(udp_port: int = 8889, timeout: float = 3.0,
+                           stop: Optional[ScanStop] = None,
+                           broadcast_addrs: Tuple[str, ...] = ('<broadcast>',)) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Discover ESP32 devices using UDP broadcast.
+
+    broadcast_addrs may hold directed broadcasts such as 192.168.1.255
+    instead of the limited broadcast; all of them are sent from one socket
+    and share the one timeout. If stop is given, the scan ends as soon as
+    it is set.
+    """
+    devices = []
+
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.setblocking(False)
+
+        # Send multiple broadcasts back-to-back in one syscall
+        for broadcast_addr in broadcast_addrs:
+            try:
+                sendmmsg_copies(sock, _STATUS_CMD, (broadcast_addr, udp_port), 3)
+            except OSError:
+                continue  # No route to that subnet any more
+
+        # Collect responses, waking only when a datagram is ready
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+        if stop:
+            sel.register(stop, selectors.EVENT_READ)
+        deadline = time.monotonic() + timeout
+        seen_ips = set()   # Repeat replies to our three probes
+        seen_macs = set()  # Same device answering from another address
+
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = sel.select(timeout=remaining)
+                if stop and stop.is_set():
+                    break
+                if not events:
+                    continue
+
+                # Drain everything that has arrived, a batch per syscall
+                for data, addr in recvmmsg_batch(sock):
+                    ip = addr[0]
+                    if ip in seen_ips:
+                        continue
+
+                    seen_ips.add(ip)
+                    try:
+                        response = _loads(data)
+                    except ValueError:
+                        continue
+                    if not isinstance(response, dict):
+                        continue
+
+                    mac = status_mac(response) or ip
+                    if mac in seen_macs:
+                        continue
+                    seen_macs.add(mac)
+
+                    if response.get("success"):
+                        devices.append((ip, response))
+        finally:
+            sel.close()
+            sock.close()
 
     except Exception as e:
         print(f"Discovery error: {e}")
@@ -117,43 +470,108 @@ def discover_udp_broadcast(udp_port: int = 8889, timeout: float = 3.0) -> List[T
     return devices
 
 
+def subnet_broadcasts(devices: List[Dict[str, Any]]) -> List[str]:
+    """Directed /24 broadcast addresses of the cached devices, most recent first."""
+    addrs = []
+    for d in devices:
+        try:
+            net = ipaddress.IPv4Network(d["ip"] + "/24", strict=False)
+        except ValueError:
+            continue
+        bcast = str(net.broadcast_address)
+        if bcast not in addrs:
+            addrs.append(bcast)
+    return addrs
+
+
+def discover_near_cached(devices: List[Dict[str, Any]], udp_port: int = 8889,
+                         timeout: float = 3.0,
+                         stop: Optional[ScanStop] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Broadcast scan that tries the cached devices' subnets first.
+
+    Directed broadcasts get through some routers and host firewalls that drop
+    255.255.255.255. They all go out at once and get up to a second between
+    them; the limited broadcast is only sent if they find nothing, and gets
+    what is left of timeout.
+    """
+    deadline = time.monotonic() + timeout
+    bcasts = tuple(subnet_broadcasts(devices))
+    if bcasts:
+        found = discover_udp_broadcast(udp_port, timeout=min(1.0, timeout / 2),
+                                       stop=stop, broadcast_addrs=bcasts)
+        if found or (stop and stop.is_set()):
+            return found
+    return discover_udp_broadcast(udp_port, timeout=deadline - time.monotonic(),
+                                  stop=stop)
+
+
 def main():
     print("=" * 60)
     print(" ESP32 Device Discovery Tool")
     print("=" * 60)
 
-    # Try cached IP first
-    cached_ip = load_cached_ip()
-    if cached_ip:
-        print(f"\n[1] Trying cached IP ({cached_ip})...")
-        if test_ip(cached_ip):
-            print(f"    ✓ Cached IP still valid!")
-            print(f"\n    Device available at: {cached_ip}")
+    cache = load_cache()
+    cached = cache["devices"]
+
+    # A recent broadcast already refreshed the cache; trust it if it answers
+    if cached and time.time() - cache["last_broadcast_ts"] < BROADCAST_DEBOUNCE:
+        alive = probe_cached_devices(cached)
+        if alive:
+            print(f"\n[1] Scanned recently; {len(alive)} of {len(cached)} cached device(s) still valid!")
+            macs = {d["ip"]: d.get("mac") for d in cached}
+            save_devices([(ip, macs.get(ip)) for ip in alive])
+            for ip in alive:
+                print(f"\n    Device available at: {ip}")
             print("=" * 60)
             return
-        else:
-            print("    ✗ Cached IP no longer responds")
 
-    # Try mDNS
-    print("\n[2] Trying mDNS resolution (esp32-controller.local)...")
-    mdns_ip = discover_mdns()
-
-    if mdns_ip:
-        print(f"    ✓ Found via mDNS: {mdns_ip}")
-        save_ip(mdns_ip)
-    else:
-        print("    ✗ mDNS resolution failed")
-
-    # Try UDP broadcast
-    print("\n[3] Performing UDP broadcast scan...")
-    print("    Listening for responses (3 seconds)...")
-    devices = discover_udp_broadcast()
+    # Probe cached devices, mDNS and broadcast at once; first success wins
+    mdns_target = MDNS_SERVICE_TYPE if Zeroconf else "esp32-controller.local"
+    print(f"\n[1] Trying {len(cached)} cached device(s), mDNS "
+          f"({mdns_target}) and UDP broadcast concurrently...")
+    print("    Listening for responses (up to 3 seconds)...")
+
+    stop = ScanStop()
+    pool = ThreadPoolExecutor(max_workers=3)
+    cache_future = pool.submit(probe_cached_devices, cached)
+    mdns_future = pool.submit(discover_mdns)
+    broadcast_future = pool.submit(discover_near_cached, cached, stop=stop)
+    broadcast_future.add_done_callback(lambda _: stop.close())
+
+    alive, mdns_ips, devices = [], [], []
+    pending = {cache_future, mdns_future, broadcast_future}
+    while pending and not (alive or mdns_ips or devices):
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if cache_future in done:
+            alive = cache_future.result()
+        if mdns_future in done:
+            mdns_ips = mdns_future.result()
+        if broadcast_future in done:
+            devices = broadcast_future.result()
+
+    # Cancel whatever is still running
+    stop.set()
+    pool.shutdown(wait=False)
+
+    if alive:
+        print(f"    ✓ Cached device(s) still valid!")
+        macs = {d["ip"]: d.get("mac") for d in cached}
+        save_devices([(ip, macs.get(ip)) for ip in alive])
+        for ip in alive:
+            print(f"\n    Device available at: {ip}")
+        print("=" * 60)
+        return
+
+    if mdns_ips:
+        print(f"    ✓ Found via mDNS: {', '.join(mdns_ips)}")
+        save_devices([(ip, None) for ip in mdns_ips])
 
     if devices:
         print(f"\n    ✓ Found {len(devices)} device(s):\n")
-        # Save the first device found
-        if devices:
-            save_ip(devices[0][0])
+        # Remember every device found
+        save_devices([(ip, status_mac(info)) for ip, info in devices],
+                     broadcast=True)
 
         for i, (ip, info) in enumerate(devices, 1):
             print(f"    Device #{i}: {ip}")
@@ -176,15 +594,15 @@ def main():
                 print(f"      MAC Address:   {wifi_info.get('mac', 'N/A')}")
 
             print()
-    else:
-        print("    ✗ No devices found via UDP broadcast")
+    elif not mdns_ips:
+        print("    ✗ No devices found via cache, mDNS or UDP broadcast")
 
     # Summary
     print("\n" + "=" * 60)
-    if mdns_ip or devices:
+    if mdns_ips or devices:
         print("Discovery complete! Use one of the following IPs:")
-        if mdns_ip:
-            print(f"  - {mdns_ip} (via mDNS)")
+        for ip in mdns_ips:
+            print(f"  - {ip} (via mDNS)")
         for ip, _ in devices:
             print(f"  - {ip} (via UDP)")
     else:
@@ -6,7 +6,8 @@ Demonstrates various commands and features of the ESP32 controller.
 
 import time
 import sys
-from python_client import ESP32Controller
+import select
+from python_client import ESP32Controller, deadline_sleep
 
 
 def demo_basic_commands(esp: ESP32Controller):
@@ -57,10 +58,12 @@ def demo_basic_commands(esp: ESP32Controller):
 
     time.sleep(1)
 
-    # Toggle pin
+    # Toggle pin, reading it back in the same round-trip
     print("\n4. Toggling pin 13...")
-    if esp.toggle_pin(13):
-        state = esp.get_pin(13)
+    toggled, read_back = esp.send_tcp_batch([{"cmd": "TOGGLE", "pin": 13},
+                                             {"cmd": "GET", "pin": 13}])
+    if toggled and toggled.get("success") and read_back and read_back.get("success"):
+        state = read_back.get("value")
         print(f"   ✓ Toggled to {state} ({'HIGH' if state else 'LOW'})")
     else:
         print("   ✗ Failed to toggle")
@@ -93,25 +96,20 @@ def demo_pwm_control(esp: ESP32Controller):
 
     time.sleep(0.5)
 
+    # Each fade runs on the ESP32, so timing is unaffected by network jitter
     print(f"\n2. Fading pin {pin} up (0 -> 255)...")
-    for value in range(0, 256, 32):
-        if esp.set_pwm(pin, value):
-            print(f"   PWM = {value:3d}")
-        else:
-            print(f"   ✗ Failed at {value}")
-            break
-        time.sleep(0.1)
+    if esp.pwm_ramp(pin, 0, 255, step=32, delay_ms=100):
+        print("   ✓ Success")
+    else:
+        print("   ✗ Failed")
 
     time.sleep(0.5)
 
     print(f"\n3. Fading pin {pin} down (255 -> 0)...")
-    for value in range(255, -1, -32):
-        if esp.set_pwm(pin, value):
-            print(f"   PWM = {value:3d}")
-        else:
-            print(f"   ✗ Failed at {value}")
-            break
-        time.sleep(0.1)
+    if esp.pwm_ramp(pin, 255, 0, step=32, delay_ms=100):
+        print("   ✓ Success")
+    else:
+        print("   ✗ Failed")
 
     return True
 
@@ -125,38 +123,35 @@ def demo_multiple_pins(esp: ESP32Controller):
     pins = [12, 13, 14, 15]
 
     print(f"\n1. Setting pins {pins} all HIGH...")
-    for pin in pins:
+    start = time.monotonic()
+    for i, pin in enumerate(pins, 1):
         if esp.set_pin(pin, 1):
             print(f"   Pin {pin}: ✓")
         else:
             print(f"   Pin {pin}: ✗")
-        time.sleep(0.2)
+        deadline_sleep(start + i * 0.2)
 
     time.sleep(1)
 
     print(f"\n2. Setting pins {pins} all LOW...")
-    for pin in pins:
+    start = time.monotonic()
+    for i, pin in enumerate(pins, 1):
         if esp.set_pin(pin, 0):
             print(f"   Pin {pin}: ✓")
         else:
             print(f"   Pin {pin}: ✗")
-        time.sleep(0.2)
+        deadline_sleep(start + i * 0.2)
 
     time.sleep(1)
 
     print(f"\n3. Knight Rider effect on pins {pins}...")
-    for _ in range(3):
-        # Forward
-        for pin in pins:
-            esp.set_pin(pin, 1)
-            time.sleep(0.1)
-            esp.set_pin(pin, 0)
-
-        # Backward
-        for pin in reversed(pins):
-            esp.set_pin(pin, 1)
-            time.sleep(0.1)
-            esp.set_pin(pin, 0)
+    # Forward then backward, three times, executed on the ESP32 in one go
+    steps = []
+    for pin in (pins + list(reversed(pins))) * 3:
+        steps.append({"pin": pin, "value": 1, "delay_ms": 100})
+        steps.append({"pin": pin, "value": 0, "delay_ms": 0})
+    if not esp.run_sequence(steps):
+        print("   ✗ Sequence failed")
 
     return True
 
@@ -170,27 +165,31 @@ def demo_udp_vs_tcp(esp: ESP32Controller):
     pin = 13
     iterations = 10
 
+    # Commands are pipelined so throughput is not bound by round-trip time
+    commands = [{"cmd": "SET", "pin": pin, "value": 1},
+                {"cmd": "SET", "pin": pin, "value": 0}] * iterations
+
     # Test TCP
     print(f"\n1. Testing TCP: {iterations} commands...")
     start_time = time.time()
-    for _ in range(iterations):
-        esp.set_pin(pin, 1, use_tcp=True)
-        esp.set_pin(pin, 0, use_tcp=True)
+    responses = esp.send_tcp_batch(commands)
     tcp_time = time.time() - start_time
+    tcp_ok = sum(1 for r in responses if r and r.get("success"))
     print(f"   TCP Time: {tcp_time:.3f} seconds")
-    print(f"   Rate: {(iterations * 2) / tcp_time:.1f} commands/sec")
+    print(f"   Rate: {tcp_ok / tcp_time:.1f} commands/sec")
 
     time.sleep(0.5)
 
     # Test UDP
     print(f"\n2. Testing UDP: {iterations} commands...")
     start_time = time.time()
-    for _ in range(iterations):
-        esp.set_pin(pin, 1, use_tcp=False)
-        esp.set_pin(pin, 0, use_tcp=False)
+    responses = esp.send_udp_batch(commands)
     udp_time = time.time() - start_time
+    udp_ok = sum(1 for r in responses if r.get("success"))
     print(f"   UDP Time: {udp_time:.3f} seconds")
-    print(f"   Rate: {(iterations * 2) / udp_time:.1f} commands/sec")
+    print(f"   Rate: {udp_ok / udp_time:.1f} commands/sec")
+    if udp_ok < len(commands):
+        print(f"   ({len(commands) - udp_ok} UDP replies lost)")
 
     print(f"\n3. Performance comparison:")
     print(f"   UDP is {tcp_time / udp_time:.1f}x faster than TCP")
@@ -282,6 +281,23 @@ def run_interactive_mode(esp: ESP32Controller):
             print(f"Error: {e}")
 
 
+def _prompt_for_ip(timeout: float = 10.0) -> str:
+    """Ask for the ESP32's IP, giving up after timeout seconds ("" if none)."""
+    print(f"\nEnter the ESP32's IP address (or wait {timeout:.0f}s to quit): ",
+          end="", flush=True)
+    try:
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    except (OSError, ValueError):
+        ready = [sys.stdin]  # Can't select on stdin here (e.g. Windows)
+    if not ready:
+        print()
+        return ""
+    try:
+        return sys.stdin.readline().strip()
+    except OSError:
+        return ""
+
+
 def main():
     """Main demo program."""
     print("=" * 60)
@@ -298,9 +314,14 @@ def main():
         print("  • Make sure the ESP32 is powered on")
         print("  • Verify the ESP32 is connected to WiFi")
         print("  • Check that your computer is on the same network")
-        print("\nAlternatively, specify the IP address manually:")
-        print('  esp = ESP32Controller("192.168.1.100", verbose=False)')
-        return 1
+
+        # Let the user name the device rather than rerunning the script
+        ip = _prompt_for_ip()
+        if not ip:
+            print("\nAlternatively, specify the IP address manually:")
+            print('  esp = ESP32Controller("192.168.1.100", verbose=False)')
+            return 1
+        esp = ESP32Controller(ip, verbose=False)
 
     print(f"✓ Found ESP32 at {esp.host}")
 
@@ -1,13 +1,207 @@
 # Example Python client for ESP32 Pin Controller
 
+import asyncio
 import socket
+import selectors
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Dict, Any, Optional, List, Tuple
 import struct
 import os
+import ipaddress
+import random
+from functools import lru_cache
 from pathlib import Path
 
+# Use orjson for encoding/decoding when installed, else the standard library.
+# Either way _dumps returns UTF-8 bytes, ready for the socket
+try:
+    import orjson as _json
+
+    _dumps = _json.dumps
+    _loads = _json.loads
+except ImportError:
+    # Compact, like orjson and the firmware's own replies. Built once:
+    # json.dumps() with non-default options makes a new encoder per call
+    _encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def _dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode()
+
+    _loads = json.loads  # Reuses the json module's shared decoder
+
+# Pulls one JSON object off the front of the TCP receive buffer
+_decoder = json.JSONDecoder()
+
+
+# Wire format of the fixed-shape pin commands (newline-terminated for TCP;
+# the firmware trims the newline from UDP datagrams)
+_PIN_TMPLS = {
+    "SET": b'{"cmd":"SET","pin":%d,"value":%d}\n',
+    "GET": b'{"cmd":"GET","pin":%d}\n',
+    "TOGGLE": b'{"cmd":"TOGGLE","pin":%d}\n',
+    "PWM": b'{"cmd":"PWM","pin":%d,"value":%d}\n',
+}
+
+
+# Opt-in binary UDP framing for pin commands: [opcode, pin, value] in,
+# [success, value] out
+_BINARY_OPS = {"SET": 0x01, "GET": 0x02, "TOGGLE": 0x03, "PWM": 0x04}
+_BINARY_REQUEST = struct.Struct('!BBB')
+_BINARY_REPLY = struct.Struct('!BB')
+
+
+@lru_cache(maxsize=256)
+def _encode(cmd: str, pin: int, value: Optional[int] = None) -> bytes:
+    """Encoded pin command; repeated (cmd, pin, value) calls reuse the bytes."""
+    tmpl = _PIN_TMPLS[cmd]
+    return tmpl % (pin,) if value is None else tmpl % (pin, value)
+
+# Parameterless commands, as bare datagrams and as TCP command lines
+_STATUS_CMD = b'{"cmd":"STATUS"}'
+_STATUS_CMD_NL = _STATUS_CMD + b'\n'
+_RESET_CMD = b'{"cmd":"RESET"}'
+_RESET_CMD_NL = _RESET_CMD + b'\n'
+_RESET_PINS_CMD_NL = b'{"cmd":"RESET_PINS"}\n'
+
+
+def maybe_ip(host: str) -> Optional[str]:
+    """Return host if it is already a dotted-quad IPv4 address, else None."""
+    try:
+        socket.inet_pton(socket.AF_INET, host)
+        return host
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _resolve(host: str) -> str:
+    """Resolve a hostname (or pass through an IP) to an IPv4 address, once."""
+    return maybe_ip(host) or socket.getaddrinfo(
+        host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+
+
+# mDNS group and DNS wire formats, for asking .local names directly
+# instead of through the OS resolver (which can stall for seconds)
+_MDNS_ADDR = ("224.0.0.251", 5353)
+_DNS_HEADER = struct.Struct('!HHHHHH')  # id, flags, qd/an/ns/ar counts
+_DNS_RR = struct.Struct('!HHIH')  # type, class, TTL, rdata length
+_DNS_TYPE_A = 1
+_DNS_CLASS_IN_QU = 0x8001  # Class IN, asking for a unicast reply
+
+
+def _dns_name(data: bytes, off: int) -> Tuple[str, int]:
+    """Read a (possibly compressed) DNS name; return it and the offset past it."""
+    labels = []
+    end = None
+    for _ in range(128):  # Bounds pointer loops in malformed packets
+        length = data[off]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = off + 2
+            off = ((length & 0x3F) << 8) | data[off + 1]
+            continue
+        off += 1
+        if length == 0:
+            return '.'.join(labels), off if end is None else end
+        labels.append(data[off:off + length].decode(errors='replace'))
+        off += length
+    raise ValueError("Malformed DNS name")
+
+
+def _mdns_answer(data: bytes, name: str, query_id: int = 0) -> Optional[str]:
+    """Return the IPv4 address an mDNS response to query_id gives for name, if any."""
+    try:
+        rid, flags, qdcount, ancount, nscount, arcount = _DNS_HEADER.unpack_from(data)
+        if not flags & 0x8000:
+            return None  # Someone else's query
+        if rid not in (query_id, 0):
+            return None  # Answer to an earlier or another client's query
+        off = _DNS_HEADER.size
+        for _ in range(qdcount):
+            off = _dns_name(data, off)[1] + 4  # Skip type and class
+        for _ in range(ancount + nscount + arcount):
+            rname, off = _dns_name(data, off)
+            rtype, _, _, rdlength = _DNS_RR.unpack_from(data, off)
+            off += _DNS_RR.size
+            if rtype == _DNS_TYPE_A and rdlength == 4 and rname.lower() == name.lower():
+                return socket.inet_ntoa(data[off:off + 4])
+            off += rdlength
+    except (IndexError, ValueError, struct.error):
+        pass
+    return None
+
+
+def mdns_query(hostname: str, timeout: float) -> Optional[str]:
+    """Multicast an A query for a .local hostname; return the first address answered."""
+    name = hostname.rstrip('.')
+    qname = b''.join(bytes([len(label)]) + label
+                     for label in name.encode().split(b'.')) + b'\x00'
+    # One-shot queries get their ID echoed back: a fresh one per call keeps
+    # late answers to an earlier query from being taken for this one
+    query_id = random.getrandbits(16)
+    query = (_DNS_HEADER.pack(query_id, 0, 1, 0, 0, 0) + qname
+             + struct.pack('!HH', _DNS_TYPE_A, _DNS_CLASS_IN_QU))
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sel = selectors.DefaultSelector()
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        sock.setblocking(False)
+        sock.sendto(query, _MDNS_ADDR)
+        sel.register(sock, selectors.EVENT_READ)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(timeout=remaining):
+                return None
+            try:
+                data, _ = sock.recvfrom(9000)
+            except OSError:
+                continue
+            ip = _mdns_answer(data, name, query_id)
+            if ip:
+                return ip
+    finally:
+        sel.close()
+        sock.close()
+
+
+# Address of the interface on the default route, once found
+_outbound_ip_cache: Optional[str] = None
+
+
+def _outbound_ip() -> Optional[str]:
+    """Return this host's IPv4 address on the default route (looked up once)."""
+    global _outbound_ip_cache
+    if _outbound_ip_cache is None:
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))  # Picks a route; sends nothing
+                _outbound_ip_cache = s.getsockname()[0]
+        except OSError:
+            pass  # No route yet: try again next time
+    return _outbound_ip_cache
+
+
+def _tune_tcp(sock: socket.socket):
+    """Set up a command connection for small, latency-bound request/reply pairs."""
+    # Don't let Nagle hold commands back, and notice a vanished ESP32 sooner
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Linux only: ACK the ESP32 at once rather than after the delayed-ACK
+    # timer. The kernel may fall back to delayed ACKs later on
+    if hasattr(socket, "TCP_QUICKACK"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
+def deadline_sleep(deadline: float):
+    """Sleep until the given time.monotonic() deadline (no-op if it has passed)."""
+    time.sleep(max(0.0, deadline - time.monotonic()))
+
 
 class ESP32Controller:
     """
@@ -15,11 +209,67 @@ class ESP32Controller:
     Supports both TCP and UDP protocols with automatic device discovery.
     """
 
-    # Cache file for last known IP
+    # Cache file for known devices (shared with discover_esp32.py)
     _CACHE_FILE = Path.home() / ".esp32_last_ip"
+    _CACHE_MAX_DEVICES = 16
+
+    # The cache as last read or written by this process, so repeated
+    # find_esp32()/connect calls don't stat and re-read the file
+    _cache_memo: Optional[Dict[str, Any]] = None
+
+    # A cached IP confirmed this recently (seconds) is used without probing
+    _CACHE_TTL = 300.0
+
+    # TCP timeouts (seconds): the handshake is quick on a LAN, so a gone
+    # device fails fast; the banner can wait for the ESP32's loop (e.g. a
+    # running SEQ); command replies are short so a dropped packet doesn't
+    # stall the caller
+    _TCP_CONNECT_TIMEOUT = 1.0
+    _TCP_BANNER_TIMEOUT = 5.0
+    _TCP_IO_TIMEOUT = 0.5
+
+    # Once a full welcome-banner line has arrived, stop after this much quiet
+    # (the firmware sends the whole banner in one write)
+    _TCP_BANNER_QUIET = 0.05
+
+    # Most ops the firmware accepts in one BATCH command (MAX_BATCH_OPS)
+    _MAX_BATCH_OPS = 32
+
+    # Once a device has answered a discovery scan, stop after this long
+    # without a new one (repeat replies to rebroadcasts don't count)
+    _DISCOVERY_IDLE = 0.5
+
+    # How often a cancellable discovery scan checks whether it was cancelled
+    _DISCOVERY_STOP_POLL = 0.1
+
+    # A discovery scan rebroadcasts its probe at these (offset, ±jitter)
+    # times in seconds, backing off exponentially, so one dropped datagram
+    # doesn't hide every device and scans started together don't collide
+    _DISCOVERY_BROADCASTS = ((0.0, 0.0), (0.15, 0.025), (0.45, 0.05), (1.05, 0.1))
+
+    # Unicast sweep used where broadcasts don't get through (e.g. in a
+    # container): probes go out this many at a time, this far apart
+    # (seconds), so the ARP queue isn't flooded; then replies get this long
+    _RANGE_SCAN_BATCH = 32
+    _RANGE_SCAN_PACE = 0.01
+    _RANGE_SCAN_TIMEOUT = 1.0
+
+    # Share of discover_devices' timeout held back for that sweep, so the
+    # broadcast and the fallback together still end within the timeout
+    _RANGE_FALLBACK_SHARE = 0.5
+
+    # Idle TCP connections left by closed controllers, one per (ip, port),
+    # so the next controller for that device skips the handshake and banner
+    _tcp_pool: Dict[Tuple[str, int], socket.socket] = {}
+    _tcp_pool_lock = threading.Lock()
+
+    # A finished discovery scan's socket, kept for the next controller's
+    # UDP commands instead of closing it and opening another
+    _spare_udp_sock: Optional[socket.socket] = None
+    _spare_udp_lock = threading.Lock()
 
     def __init__(self, host: Optional[str] = None, tcp_port: int = 8888, udp_port: int = 8889,
-                 auto_discover: bool = False, verbose: bool = True):
+                 auto_discover: bool = False, verbose: bool = True, binary_mode: bool = False):
         """
         Initialize the ESP32 controller client.
 
@@ -29,12 +279,19 @@ class ESP32Controller:
             udp_port: UDP server port (default: 8889)
             auto_discover: Automatically discover device if host is None
             verbose: Print status messages (default: True)
+            binary_mode: Send UDP pin commands in the 3-byte binary framing
+                instead of JSON (default: False)
         """
         self.tcp_port = tcp_port
         self.udp_port = udp_port
         self.tcp_socket = None
-        self.tcp_file = None  # File-like interface for line reading
+        self._rxbuf = bytearray(8192)  # recv_into target; grows if a reply is larger
+        self._rxlen = 0  # Bytes of _rxbuf received but not yet framed
+        self._udp_sock = None  # Reused across send_udp calls
+        self._udp_lock = threading.Lock()
+        self._udp_stale = False  # A late reply may still be queued
         self.verbose = verbose
+        self.binary_mode = binary_mode
 
         # Auto-discover if no host specified
         if host is None and auto_discover:
@@ -47,41 +304,82 @@ class ESP32Controller:
                 "Host must be specified or auto_discover must be True")
 
         self.host = host
-        # Save the IP for future use
-        ESP32Controller._save_ip(self.host)
+        # Resolve once so hostnames don't cost a lookup on every command
+        try:
+            self._ip = _resolve(host)
+        except OSError:
+            self._ip = host  # Let connect/sendto report the failure
+        # Save the IP for future use (it is confirmed once connect_tcp succeeds)
+        ESP32Controller._save_ip(self.host, confirmed=False)
         if self.verbose:
             print(f"\nUsing ESP32 at {self.host}")
 
     @staticmethod
-    def _save_ip(ip: str):
-        """Save the last successful IP address to cache file."""
-        try:
-            with open(ESP32Controller._CACHE_FILE, 'w') as f:
-                f.write(ip)
-        except Exception:
-            pass  # Silently fail if we can't save
+    def _load_cache() -> Dict[str, Any]:
+        """Return the cache as {"devices": [...], "last_broadcast_ts": float}."""
+        if ESP32Controller._cache_memo is None:
+            ESP32Controller._cache_memo = ESP32Controller._read_cache_file()
+        memo = ESP32Controller._cache_memo
+        return {"devices": list(memo["devices"]),
+                "last_broadcast_ts": memo["last_broadcast_ts"]}
 
     @staticmethod
-    def _load_cached_ip() -> Optional[str]:
-        """Load the last successful IP address from cache file."""
+    def _read_cache_file() -> Dict[str, Any]:
+        """Parse the cache file, accepting the older list and bare-IP formats."""
+        cache = {"devices": [], "last_broadcast_ts": 0.0}
         try:
             if ESP32Controller._CACHE_FILE.exists():
                 with open(ESP32Controller._CACHE_FILE, 'r') as f:
-                    ip = f.read().strip()
-                    if ip:
-                        return ip
+                    text = f.read().strip()
+                if not text:
+                    return cache
+                try:
+                    data = json.loads(text)
+                except ValueError:
+                    # Older cache files hold a single bare IP
+                    cache["devices"] = [{"ip": text, "mac": None, "last_seen": 0.0}]
+                    return cache
+                if isinstance(data, dict):
+                    cache["last_broadcast_ts"] = float(data.get("last_broadcast_ts", 0.0))
+                    data = data.get("devices", [])
+                if isinstance(data, list):
+                    cache["devices"] = [r for r in data if isinstance(r, dict) and r.get("ip")]
         except Exception:
             pass
-        return None
+        return cache
+
+    @staticmethod
+    def _save_ip(ip: str, confirmed: bool = True):
+        """
+        Record ip as the most recent device in the cache file.
+
+        confirmed=True marks it as just seen responding, which lets
+        find_esp32 use it without probing for _CACHE_TTL seconds.
+        """
+        cache = ESP32Controller._load_cache()
+        old = next((r for r in cache["devices"] if r["ip"] == ip), {})
+        record = {"ip": ip, "mac": old.get("mac"),
+                  "last_seen": time.time() if confirmed else old.get("last_seen", 0.0)}
+        cache["devices"] = ([record] + [r for r in cache["devices"] if r["ip"] != ip]
+                            )[:ESP32Controller._CACHE_MAX_DEVICES]
+        ESP32Controller._cache_memo = cache
+        try:
+            with open(ESP32Controller._CACHE_FILE, 'w') as f:
+                json.dump(cache, f)
+        except Exception:
+            pass  # Silently fail if we can't save
+
+    @staticmethod
+    def _load_cached_devices() -> List[Dict[str, Any]]:
+        """Return the cache records ({"ip", "last_seen", ...}), most recent first."""
+        return ESP32Controller._load_cache()["devices"]
 
     # reset all pins to low
     def reset_pins(self):
         """Reset all pins to LOW (0)."""
-        print("Resetting all pins to LOW...")
         if self.verbose:
             print("Resetting all pins to LOW...")
-        command = {"cmd": "RESET_PINS"}
-        response = self.send_tcp(command)
+        response = self._send_bytes_tcp(_RESET_PINS_CMD_NL)
         success = response and response.get("success", False)
         if self.verbose:
             if success:
@@ -91,100 +389,249 @@ class ESP32Controller:
         return success
 
     @staticmethod
-    def _test_ip(ip: str, udp_port: int = 8889, timeout: float = 1.0) -> bool:
+    def _send_probes(sock: socket.socket, ips: List[str], udp_port: int) -> Dict[str, str]:
         """
-        Test if an IP address responds to STATUS command.
-
-        Args:
-            ip: IP address to test
-            udp_port: UDP port to test
-            timeout: Timeout in seconds
+        Send STATUS to each IP from sock.
 
-        Returns:
-            True if device responds, False otherwise
+        Returns a dict mapping each probed address to the entry it was
+        given as (so a cached hostname is reported as itself).
         """
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(timeout)
-
-            # Send STATUS command
-            status_cmd = json.dumps({"cmd": "STATUS"})
-            sock.sendto(status_cmd.encode(), (ip, udp_port))
-
-            # Wait for response
-            data, addr = sock.recvfrom(4096)
-            sock.close()
-
-            # Parse response
-            response = json.loads(data.decode())
-            return response.get("success", False)
-
-        except Exception:
-            return False
+        probed = {}
+        for ip in ips:
+            try:
+                addr = _resolve(ip)
+                sock.sendto(_STATUS_CMD, (addr, udp_port))
+            except OSError:
+                continue  # Unresolvable or unreachable entry
+            probed.setdefault(addr, ip)
+        return probed
 
     @staticmethod
-    def discover_devices(timeout: float = 3.0, udp_port: int = 8889, verbose: bool = True) -> List[Tuple[str, Dict[str, Any]]]:
+    def discover_devices(timeout: float = 3.0, udp_port: int = 8889, verbose: bool = True,
+                         stop: Optional[threading.Event] = None,
+                         range_fallback: bool = True,
+                         known_ips: Optional[List[str]] = None) -> List[Tuple[str, Dict[str, Any]]]:
         """
         Discover ESP32 devices on the local network using UDP broadcast.
 
         Args:
-            timeout: Discovery timeout in seconds
+            timeout: Maximum discovery time in seconds, including any
+                range fallback (the scan ends early once devices have
+                answered and the network goes quiet)
             udp_port: UDP port to scan (default: 8889)
             verbose: Print discovery progress (default: True)
+            stop: Event that ends the scan early when set
+            range_fallback: If the broadcast finds nothing, sweep the local
+                /24 with unicast probes (see discover_range) in the time
+                held back for it
+            known_ips: Addresses (e.g. cached ones) to also probe directly
+                from the broadcast socket; the scan ends as soon as one of
+                them answers
 
         Returns:
-            List of tuples (ip_address, status_info)
+            List of tuples (ip_address, status_info), answering known
+            addresses first
         """
         devices = []
+        known = {}
+        start = time.monotonic()
+        deadline = start + timeout
+        broadcast_end = deadline
+        if range_fallback:
+            broadcast_end -= timeout * ESP32Controller._RANGE_FALLBACK_SHARE
 
         try:
             # Create UDP socket for broadcast
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.settimeout(0.5)
+            sel = selectors.DefaultSelector()
+            parked = False
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setblocking(False)
+                # Broadcast from the default-route interface, not whichever
+                # one the OS picks for 255.255.255.255 on a multi-homed host
+                local_ip = _outbound_ip()
+                if local_ip:
+                    try:
+                        sock.bind((local_ip, 0))
+                    except OSError:
+                        pass  # Address has gone (e.g. the network changed)
+
+                # Broadcast STATUS command
+                broadcast_addr = ('<broadcast>', udp_port)
+
+                if verbose:
+                    print(f"Scanning for ESP32 devices on UDP port {udp_port}...")
+
+                # Collect responses, waking only when a datagram is ready or
+                # the next broadcast copy is due (several copies increase the
+                # chance of discovery)
+                sel.register(sock, selectors.EVENT_READ)
+                known = ESP32Controller._send_probes(sock, known_ips or [], udp_port)
+                broadcasts = [start + offset + random.uniform(-jitter, jitter)
+                              for offset, jitter in ESP32Controller._DISCOVERY_BROADCASTS]
+                last_reply = 0.0
+                discovered_ips = set()
+
+                while not (stop and stop.is_set()):
+                    now = time.monotonic()
+                    if broadcasts and now >= broadcasts[0]:
+                        sock.sendto(_STATUS_CMD, broadcast_addr)
+                        broadcasts.pop(0)
+                    remaining = broadcast_end - now
+                    if devices:
+                        remaining = min(
+                            remaining, last_reply + ESP32Controller._DISCOVERY_IDLE - now)
+                    if remaining <= 0:
+                        break
+                    if broadcasts:
+                        remaining = min(remaining, broadcasts[0] - now)
+                    if stop:
+                        remaining = min(remaining, ESP32Controller._DISCOVERY_STOP_POLL)
+                    if not sel.select(timeout=remaining):
+                        continue
+                    if ESP32Controller._drain_replies(sock, discovered_ips, devices, verbose):
+                        last_reply = time.monotonic()
+                        if any(ip in known for ip, _ in devices):
+                            break
 
-            # Broadcast STATUS command
-            status_cmd = json.dumps({"cmd": "STATUS"})
-            broadcast_addr = ('<broadcast>', udp_port)
+                ESP32Controller._park_udp_sock(sock)
+                parked = True
+            finally:
+                # An error sending or reading leaves the socket unparked
+                sel.close()
+                if not parked:
+                    sock.close()
 
+        except Exception as e:
             if verbose:
-                print(f"Scanning for ESP32 devices on UDP port {udp_port}...")
+                print(f"Discovery error: {e}")
 
-            # Send multiple broadcasts to increase chance of discovery
-            for _ in range(3):
-                sock.sendto(status_cmd.encode(), broadcast_addr)
-                time.sleep(0.1)
+        if not devices and range_fallback and not (stop and stop.is_set()):
+            devices = ESP32Controller.discover_range(
+                udp_port=udp_port, verbose=verbose, stop=stop, deadline=deadline)
+        devices.sort(key=lambda d: d[0] not in known)
+        return devices
 
-            # Collect responses
-            start_time = time.time()
-            discovered_ips = set()
+    @staticmethod
+    def _drain_replies(sock: socket.socket, seen: set,
+                       devices: List[Tuple[str, Dict[str, Any]]], verbose: bool) -> bool:
+        """
+        Receive every queued discovery reply, adding new devices to devices.
 
-            while time.time() - start_time < timeout:
-                try:
-                    data, addr = sock.recvfrom(4096)
-                    ip = addr[0]
+        Returns True if a new device was found.
+        """
+        found = False
+        while True:
+            try:
+                data, addr = sock.recvfrom(4096)
+            except OSError:
+                return found  # Nothing more queued
+            ip = addr[0]
 
-                    # Avoid duplicates
-                    if ip in discovered_ips:
-                        continue
+            # Avoid duplicates
+            if ip in seen:
+                continue
 
-                    discovered_ips.add(ip)
+            seen.add(ip)
 
-                    # Parse response
-                    response = json.loads(data.decode())
-                    if response.get("success"):
-                        devices.append((ip, response))
-                        if verbose:
-                            print(f"  Found ESP32 at {ip}")
+            # Parse response
+            try:
+                response = _loads(data)
+            except ValueError:
+                continue
+            if isinstance(response, dict) and response.get("success"):
+                devices.append((ip, response))
+                found = True
+                if verbose:
+                    print(f"  Found ESP32 at {ip}")
 
-                except socket.timeout:
-                    continue
-                except json.JSONDecodeError:
-                    continue
-                except Exception:
-                    continue
+    @staticmethod
+    def _local_subnet() -> Optional[str]:
+        """Return the /24 of the interface on the default route, e.g. "192.168.1.0/24"."""
+        ip = _outbound_ip()
+        if ip is None:
+            return None
+        return str(ipaddress.ip_network(f"{ip}/24", strict=False))
 
-            sock.close()
+    @staticmethod
+    def discover_range(cidr: Optional[str] = None, udp_port: int = 8889,
+                       timeout: Optional[float] = None, verbose: bool = True,
+                       stop: Optional[threading.Event] = None,
+                       deadline: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Discover ESP32 devices by probing every address in a subnet.
+
+        Slower than a broadcast, but works where broadcasts are dropped,
+        such as inside Docker or Kubernetes.
+
+        Args:
+            cidr: Subnet to sweep, e.g. "192.168.1.0/24" (default: the /24
+                of the interface on the default route)
+            udp_port: UDP port to scan (default: 8889)
+            timeout: How long to wait for replies after the last probe
+                (default: _RANGE_SCAN_TIMEOUT)
+            verbose: Print discovery progress (default: True)
+            stop: Event that ends the sweep early when set
+            deadline: time.monotonic() value the sweep won't run past,
+                even if probes are still unsent
+
+        Returns:
+            List of tuples (ip_address, status_info)
+        """
+        devices = []
+        cidr = cidr or ESP32Controller._local_subnet()
+        if cidr is None:
+            return devices
+        if timeout is None:
+            timeout = ESP32Controller._RANGE_SCAN_TIMEOUT
+
+        try:
+            hosts = [str(h) for h in ipaddress.ip_network(cidr, strict=False).hosts()]
+            if verbose:
+                print(f"Sweeping {cidr} ({len(hosts)} addresses) on UDP port {udp_port}...")
+
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sel = selectors.DefaultSelector()
+            sel.register(sock, selectors.EVENT_READ)
+            seen = set()
+            try:
+                # Probe a batch at a time, collecting replies in between
+                for i in range(0, len(hosts), ESP32Controller._RANGE_SCAN_BATCH):
+                    if stop and stop.is_set():
+                        return devices
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return devices
+                    for ip in hosts[i:i + ESP32Controller._RANGE_SCAN_BATCH]:
+                        try:
+                            sock.sendto(_STATUS_CMD, (ip, udp_port))
+                        except OSError:
+                            continue  # Unreachable or send buffer full
+                    if sel.select(timeout=ESP32Controller._RANGE_SCAN_PACE):
+                        ESP32Controller._drain_replies(sock, seen, devices, verbose)
+
+                # Then wait for stragglers, as in discover_devices
+                wait_end = time.monotonic() + timeout
+                if deadline is not None:
+                    wait_end = min(wait_end, deadline)
+                last_reply = time.monotonic()
+                while not (stop and stop.is_set()):
+                    now = time.monotonic()
+                    remaining = wait_end - now
+                    if devices:
+                        remaining = min(
+                            remaining, last_reply + ESP32Controller._DISCOVERY_IDLE - now)
+                    if remaining <= 0:
+                        break
+                    if stop:
+                        remaining = min(remaining, ESP32Controller._DISCOVERY_STOP_POLL)
+                    if sel.select(timeout=remaining) and \
+                            ESP32Controller._drain_replies(sock, seen, devices, verbose):
+                        last_reply = time.monotonic()
+            finally:
+                sel.close()
+                sock.close()
 
         except Exception as e:
             if verbose:
@@ -197,6 +644,10 @@ class ESP32Controller:
         """
         Try to resolve ESP32 using mDNS.
 
+        .local names are asked for with a multicast mDNS query, which
+        returns on the first answer; other names go to the OS resolver.
+        Neither touches the process-wide default socket timeout.
+
         Args:
             hostname: mDNS hostname (default: "esp32.local")
             timeout: Resolution timeout in seconds
@@ -206,20 +657,32 @@ class ESP32Controller:
             IP address if found, None otherwise
         """
         try:
-            # Try to resolve mDNS hostname
-            socket.setdefaulttimeout(timeout)
-            ip = socket.gethostbyname(hostname)
+            if hostname.rstrip('.').lower().endswith('.local'):
+                ip = mdns_query(hostname, timeout)
+            else:
+                # getaddrinfo takes no timeout, so wait for it on a worker
+                pool = ThreadPoolExecutor(max_workers=1)
+                try:
+                    ip = pool.submit(_resolve, hostname).result(timeout=timeout)
+                finally:
+                    pool.shutdown(wait=False)
+            if ip is None:
+                if verbose:
+                    print(f"No mDNS answer for {hostname}")
+                return None
             if verbose:
                 print(f"Resolved {hostname} to {ip}")
             return ip
+        except FuturesTimeoutError:
+            if verbose:
+                print(f"Resolving {hostname} timed out")
+            return None
         except socket.gaierror:
             return None
         except Exception as e:
             if verbose:
                 print(f"mDNS resolution error: {e}")
             return None
-        finally:
-            socket.setdefaulttimeout(None)
 
     @staticmethod
     def find_esp32(mdns_hostname: str = "esp32-controller.local",
@@ -229,12 +692,15 @@ class ESP32Controller:
                    verbose: bool = True) -> Optional[str]:
         """
         Automatically find ESP32 device on the network.
-        Tries cached IP first, then mDNS, then falls back to UDP broadcast scan.
+        Tries the cached IPs, mDNS and a UDP broadcast scan concurrently and
+        returns the first device found (preferring a cached IP, then mDNS,
+        when several answer at once).
 
         Args:
             mdns_hostname: mDNS hostname to try
             udp_port: UDP port for broadcast scan
-            scan_timeout: Timeout for broadcast scan
+            scan_timeout: Timeout for the whole search (the broadcast scan
+                and its range fallback; also caps the mDNS lookup)
             use_cache: Whether to try cached IP first (default: True)
             verbose: Print search progress (default: True)
 
@@ -244,61 +710,100 @@ class ESP32Controller:
         if verbose:
             print("=== Searching for ESP32 device ===")
 
-        # Try cached IP first (fastest)
-        if use_cache:
-            cached_ip = ESP32Controller._load_cached_ip()
-            if cached_ip:
-                if verbose:
-                    print(f"\n1. Trying cached IP ({cached_ip})...")
-                if ESP32Controller._test_ip(cached_ip, udp_port=udp_port):
-                    if verbose:
-                        print("   ✓ Cached IP still valid!")
-                    return cached_ip
-                if verbose:
-                    print("   ✗ Cached IP no longer responds")
+        cached = ESP32Controller._load_cached_devices() if use_cache else []
+        cached_ips = [r["ip"] for r in cached]
 
-        # Try mDNS (faster if available)
-        if verbose:
-            print(f"\n2. Trying mDNS resolution ({mdns_hostname})...")
-        ip = ESP32Controller.discover_mdns(mdns_hostname, verbose=verbose)
-        if ip:
-            ESP32Controller._save_ip(ip)
-            return ip
-        if verbose:
-            print("   mDNS not available or device not found")
+        # Seen responding moments ago: skip the probe entirely
+        if cached and time.time() - cached[0].get("last_seen", 0.0) < ESP32Controller._CACHE_TTL:
+            if verbose:
+                print(f"\nUsing recently seen cached IP ({cached_ips[0]})")
+            return cached_ips[0]
 
-        # Fall back to UDP broadcast scan
         if verbose:
-            print(f"\n3. Performing UDP broadcast scan...")
-        devices = ESP32Controller.discover_devices(
-            timeout=scan_timeout, udp_port=udp_port, verbose=verbose)
+            methods = [f"{len(cached_ips)} cached IP(s)"] if cached_ips else []
+            methods += [f"mDNS ({mdns_hostname})", "UDP broadcast scan"]
+            print(f"\nTrying {', '.join(methods)} concurrently...")
+
+        # The cached IPs are probed from the broadcast scan's socket, so
+        # their replies and the broadcast's arrive together
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=2)
+        scan = pool.submit(
+            ESP32Controller.discover_devices, timeout=scan_timeout,
+            udp_port=udp_port, verbose=False, stop=stop, known_ips=cached_ips)
+        mdns = pool.submit(ESP32Controller.discover_mdns, mdns_hostname,
+                           timeout=min(2.0, scan_timeout), verbose=False)
+
+        ip = method = None
+        pending = {scan, mdns}
+        try:
+            while pending and ip is None:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                devices = scan.result() if scan.done() else []
+                if devices and devices[0][0] in cached_ips:
+                    ip, method = devices[0][0], "cached IP"
+                elif mdns.done() and mdns.result():
+                    ip, method = mdns.result(), "mDNS"
+                elif devices:
+                    ip, method = devices[0][0], "UDP broadcast"  # Use first device found
+        finally:
+            # Cancel whatever is still running
+            stop.set()
+            pool.shutdown(wait=False)
 
-        if devices:
+        if ip is None:
             if verbose:
-                print(f"\nFound {len(devices)} device(s)")
-            ip = devices[0][0]  # Use first device found
-            ESP32Controller._save_ip(ip)
-            return ip
+                print("\nNo ESP32 devices found on the network")
+            return None
 
         if verbose:
-            print("\nNo ESP32 devices found on the network")
-        return None
+            print(f"   ✓ Found via {method}: {ip}")
+        ESP32Controller._save_ip(ip)
+        return ip
+
+    def __enter__(self) -> "ESP32Controller":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def connect_tcp(self) -> bool:
-        """Establish TCP connection to ESP32."""
-        try:
-            self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.tcp_socket.settimeout(5.0)
-            self.tcp_socket.connect((self.host, self.tcp_port))
+        """Establish TCP connection to ESP32, reusing an idle pooled one if possible."""
+        if self._take_pooled_tcp():
+            if self.verbose:
+                print(f"✓ Reusing TCP connection to {self.host}:{self.tcp_port}")
+            return True
 
-            # Create file-like interface for line reading
-            self.tcp_file = self.tcp_socket.makefile('r')
+        try:
+            self.tcp_socket = socket.create_connection(
+                (self._ip, self.tcp_port), timeout=self._TCP_CONNECT_TIMEOUT)
+            _tune_tcp(self.tcp_socket)
+
+            self._rxlen = 0
+
+            # Read and discard the welcome banner (non-JSON lines): wait for
+            # its first complete line, then take whatever follows until the
+            # line goes quiet, so the number of banner lines doesn't matter
+            banner_deadline = time.monotonic() + self._TCP_BANNER_TIMEOUT
+            while self._rxbuf.find(b'\n', 0, self._rxlen) < 0:
+                self.tcp_socket.settimeout(
+                    max(0.001, banner_deadline - time.monotonic()))
+                self._recv_more()
+            self.tcp_socket.settimeout(self._TCP_BANNER_QUIET)
+            try:
+                while True:
+                    self._recv_more()
+            except socket.timeout:
+                pass
+            if self.verbose:
+                banner = bytes(self._rxbuf[:self._rxlen])
+                for line in banner.decode(errors='replace').splitlines():
+                    if line.strip():
+                        print(f"Connected: {line.strip()}")
+            self._rxlen = 0
 
-            # Read and discard welcome messages (non-JSON lines)
-            for _ in range(2):  # Expect 2 welcome lines
-                line = self.tcp_file.readline()
-                if line and self.verbose:
-                    print(f"Connected: {line.strip()}")
+            self.tcp_socket.settimeout(self._TCP_IO_TIMEOUT)
+            ESP32Controller._save_ip(self.host)
 
             if self.verbose:
                 print(
@@ -311,110 +816,413 @@ class ESP32Controller:
             return False
 
     def disconnect_tcp(self):
-        """Close TCP connection."""
-        if self.tcp_file:
-            self.tcp_file.close()
-            self.tcp_file = None
+        """Close TCP connection (and the shared UDP socket)."""
+        self._close_tcp()
+        self._close_udp()
+        if self.verbose:
+            print("TCP connection closed")
+
+    def close(self):
+        """
+        Release the TCP connection and close the shared UDP socket.
+
+        Unlike disconnect_tcp(), a TCP connection with no reply pending
+        goes to the pool for the next controller on this device, and keeps
+        one of the ESP32's MAX_TCP_CLIENTS slots until then; see close_pool().
+        """
+        self._release_tcp()
+        self._close_udp()
+
+    def __del__(self):
+        # Never pool here: module globals may already be gone at shutdown.
+        # __init__ may have raised before the sockets were set up
+        if getattr(self, "tcp_socket", None):
+            self.tcp_socket.close()
+        if getattr(self, "_udp_sock", None):
+            self._udp_sock.close()
+
+    def _close_udp(self):
+        """Close the shared UDP socket, if open."""
+        with self._udp_lock:
+            if self._udp_sock:
+                self._udp_sock.close()
+                self._udp_sock = None
+
+    def _close_tcp(self):
+        """Close the TCP socket, if open, and drop any unread bytes."""
         if self.tcp_socket:
             self.tcp_socket.close()
             self.tcp_socket = None
-        if self.verbose:
-            print("TCP connection closed")
+        self._rxlen = 0
+
+    def _release_tcp(self):
+        """Pool the TCP socket if the stream is in step, else close it."""
+        sock = self.tcp_socket
+        if sock is None or self._rxlen:
+            self._close_tcp()
+            return
+        self.tcp_socket = None
+        with ESP32Controller._tcp_pool_lock:
+            old = ESP32Controller._tcp_pool.get((self._ip, self.tcp_port))
+            ESP32Controller._tcp_pool[(self._ip, self.tcp_port)] = sock
+        if old is not None:
+            old.close()
+
+    def _take_pooled_tcp(self) -> bool:
+        """Adopt the pooled connection to this device, if it is still open and idle."""
+        with ESP32Controller._tcp_pool_lock:
+            sock = ESP32Controller._tcp_pool.pop((self._ip, self.tcp_port), None)
+        if sock is None:
+            return False
+        try:
+            sock.setblocking(False)
+            sock.recv(1, socket.MSG_PEEK)
+            # Closed by the ESP32 (b'') or holding data nobody asked for
+        except BlockingIOError:
+            sock.settimeout(self._TCP_IO_TIMEOUT)
+            self.tcp_socket = sock
+            self._rxlen = 0
+            return True
+        except OSError:
+            pass
+        sock.close()
+        return False
+
+    @staticmethod
+    def close_pool():
+        """Close every idle pooled TCP connection."""
+        with ESP32Controller._tcp_pool_lock:
+            socks = list(ESP32Controller._tcp_pool.values())
+            ESP32Controller._tcp_pool.clear()
+        for sock in socks:
+            sock.close()
 
-    def send_tcp(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def send_tcp(self, command: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Send command via TCP and get response.
 
         Args:
             command: Command dictionary
+            timeout: Reply timeout in seconds for slow commands (optional)
 
         Returns:
             Response dictionary or None on error
         """
-        if not self.tcp_socket:
-            if not self.connect_tcp():
-                return None
+        return self._send_bytes_tcp(_dumps(command) + b'\n', timeout=timeout)
 
-        try:
-            # Send command
-            cmd_str = json.dumps(command) + '\n'
-            self.tcp_socket.send(cmd_str.encode())
+    def _send_bytes_tcp(self, payload: bytes, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send an already-encoded command line via TCP and get response.
 
-            # Read response - accumulate lines until we have valid JSON
-            json_buffer = ""
-            brace_count = 0
-            in_json = False
+        If the connection turns out to be broken, reconnects and retries
+        once. A reply timeout is not retried, since the ESP32 may already
+        have executed the command.
 
-            while True:
-                line = self.tcp_file.readline()
-                if not line:
-                    raise Exception("Connection closed")
+        Args:
+            payload: Encoded, newline-terminated command
+            timeout: Reply timeout for slow commands (default: _TCP_IO_TIMEOUT)
+        """
+        for attempt in range(2):
+            if not self.tcp_socket:
+                if not self.connect_tcp():
+                    return None
+
+            try:
+                if timeout is not None:
+                    self.tcp_socket.settimeout(timeout)
+
+                # Send command
+                self.tcp_socket.sendall(payload)
+                response = self._read_json_response()
+
+                if timeout is not None:
+                    self.tcp_socket.settimeout(self._TCP_IO_TIMEOUT)
+                return response
+
+            except json.JSONDecodeError as e:
+                if self.verbose:
+                    print(f"✗ JSON parse error: {e}")
+                    print(f"Received: {e.doc[:200]}")  # Show first 200 chars
+            except socket.timeout as e:
+                if self.verbose:
+                    print(f"✗ TCP send error: {e}")
+            except Exception as e:
+                if self.verbose:
+                    print(f"✗ TCP send error: {e}")
+                if attempt == 0:
+                    if self.verbose:
+                        print("  Reconnecting and retrying...")
+                    self._close_tcp()
+                    continue
+
+            self._close_tcp()
+            return None
 
-                line = line.strip()
+        return None
 
-                # Skip empty lines before JSON starts
-                if not line:
-                    if not in_json:
-                        continue
+    def _read_line(self) -> bytes:
+        """Return the next line from the TCP stream, without its newline."""
+        while True:
+            end = self._rxbuf.find(b'\n', 0, self._rxlen)
+            if end >= 0:
+                line = bytes(self._rxbuf[:end])
+                self._consume(end + 1)
+                return line
+            self._recv_more()
+
+    def _read_json_response(self) -> Dict[str, Any]:
+        """
+        Decode the next JSON object from the TCP stream, receiving as needed.
+
+        Lines that don't start a JSON object (blank lines, plain-text
+        messages) are skipped.
+        """
+        while True:
+            # Drop whitespace and complete lines that don't start a JSON object
+            start = 0
+            while start < self._rxlen and self._rxbuf[start] != ord('{'):
+                if self._rxbuf[start] in b' \t\r\n':
+                    start += 1
+                    continue
+                end = self._rxbuf.find(b'\n', start, self._rxlen)
+                if end < 0:
+                    break
+                start = end + 1
+            self._consume(start)
+
+            if self._rxlen and self._rxbuf[0] == ord('{'):
+                # The firmware ends every reply with a newline, so nothing
+                # is parsed until the whole line has arrived
+                end = self._rxbuf.find(b'\n', 0, self._rxlen)
+                if end >= 0:
+                    try:
+                        # Usual case: the line is exactly one object
+                        obj = _loads(self._rxbuf[:end])
+                    except ValueError:
+                        # Allow trailing text after the object on its line
+                        text = self._rxbuf[:end].decode(errors='replace')
+                        try:
+                            obj, _ = _decoder.raw_decode(text)
+                        finally:
+                            self._consume(end + 1)
                     else:
-                        # Empty line after JSON started might mean end
-                        if brace_count == 0 and json_buffer:
-                            break
+                        self._consume(end + 1)
+                    return obj
+
+            self._recv_more()
+
+    def _recv_more(self):
+        """Receive into the free tail of the buffer, growing it when full."""
+        if self._rxlen == len(self._rxbuf):
+            self._rxbuf.extend(bytes(len(self._rxbuf)))
+        n = self.tcp_socket.recv_into(memoryview(self._rxbuf)[self._rxlen:])
+        if n == 0:
+            raise ConnectionError("Connection closed")
+        self._rxlen += n
+
+    def _consume(self, count: int):
+        """Discard the first count buffered bytes, moving the rest to the front."""
+        remaining = self._rxlen - count
+        if remaining:
+            self._rxbuf[:remaining] = self._rxbuf[count:self._rxlen]
+        self._rxlen = remaining
 
-                # Check if this line starts JSON
-                if line.startswith('{'):
-                    in_json = True
+    def send_udp(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Send command via UDP and get response.
 
-                # If we're in JSON, accumulate the line
-                if in_json:
-                    json_buffer += line
-                    # Count braces to know when JSON is complete
-                    brace_count += line.count('{') - line.count('}')
+        Args:
+            command: Command dictionary
 
-                    # When braces balance, we have complete JSON
-                    if brace_count == 0 and json_buffer:
-                        return json.loads(json_buffer)
+        Returns:
+            Response dictionary or None on error
+        """
+        return self._send_bytes_udp(_dumps(command))
 
-        except json.JSONDecodeError as e:
+    def _send_bytes_udp(self, payload: bytes) -> Optional[Dict[str, Any]]:
+        """Send an already-encoded command via UDP and get response."""
+        try:
+            return _loads(self._udp_roundtrip(payload))
+        except Exception as e:
             if self.verbose:
-                print(f"✗ JSON parse error: {e}")
-                print(f"Received: {json_buffer[:200]}")  # Show first 200 chars
-            self.disconnect_tcp()
+                print(f"✗ UDP send error: {e}")
             return None
+
+    def _send_pin_udp(self, cmd: str, pin: int, value: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send a SET/GET/TOGGLE/PWM command via UDP and get response.
+
+        In binary_mode the 2-byte reply is returned shaped like the JSON one.
+        """
+        if not self.binary_mode:
+            return self._send_bytes_udp(_encode(cmd, pin, value))
+        try:
+            reply = self._udp_roundtrip(
+                _BINARY_REQUEST.pack(_BINARY_OPS[cmd], pin, value or 0))
+            success, result = _BINARY_REPLY.unpack(reply)
+            return {"success": bool(success), "command": cmd, "pin": pin, "value": result}
         except Exception as e:
             if self.verbose:
-                print(f"✗ TCP send error: {e}")
-            self.disconnect_tcp()
+                print(f"✗ UDP send error: {e}")
             return None
 
-    def send_udp(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _udp_roundtrip(self, payload: bytes) -> bytes:
+        """Send one datagram on the shared UDP socket and return the reply."""
+        with self._udp_lock:
+            sock = self._get_udp_sock()
+            if self._udp_stale:
+                self._drain_udp(sock)
+
+            # Send command
+            sock.send(payload)
+
+            # Receive response
+            try:
+                response = sock.recv(4096)
+            except socket.timeout:
+                self._udp_stale = True
+                raise
+            return response
+
+    def _get_udp_sock(self) -> socket.socket:
         """
-        Send command via UDP and get response.
+        Return the shared UDP socket, adopting or creating it on first use.
+
+        The socket is connected to the ESP32: the kernel fixes the route
+        once, only the ESP32's datagrams are delivered to it, and a closed
+        port shows up as ConnectionRefusedError instead of a timeout.
+        """
+        if self._udp_sock is None:
+            with ESP32Controller._spare_udp_lock:
+                sock, ESP32Controller._spare_udp_sock = ESP32Controller._spare_udp_sock, None
+            if sock is not None and not ESP32Controller._sock_reaches(sock, self._ip):
+                sock.close()  # Bound to an interface on another network
+                sock = None
+            if sock is None:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            else:
+                self._udp_stale = True  # Late discovery replies may be queued
+            sock.settimeout(2.0)
+            sock.connect((self._ip, self.udp_port))
+            self._udp_sock = sock
+        return self._udp_sock
+
+    @staticmethod
+    def _sock_reaches(sock: socket.socket, ip: str) -> bool:
+        """True if sock is unbound or bound to an address on ip's /24."""
+        try:
+            local = sock.getsockname()[0]
+            return local == "0.0.0.0" or ipaddress.ip_address(ip) in \
+                ipaddress.ip_network(f"{local}/24", strict=False)
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def _park_udp_sock(sock: socket.socket):
+        """Keep a finished discovery socket for _get_udp_sock to adopt."""
+        with ESP32Controller._spare_udp_lock:
+            old, ESP32Controller._spare_udp_sock = ESP32Controller._spare_udp_sock, sock
+        if old is not None:
+            old.close()
+
+    def _drain_udp(self, sock: socket.socket):
+        """Discard replies that arrived after an earlier command timed out."""
+        sock.setblocking(False)
+        try:
+            while True:
+                sock.recv(4096)
+        except OSError:
+            pass
+        finally:
+            sock.settimeout(2.0)
+        self._udp_stale = False
+
+    def send_tcp_batch(self, commands: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Pipeline several commands over TCP in one write, then read the replies.
 
         Args:
-            command: Command dictionary
+            commands: List of command dictionaries
 
         Returns:
-            Response dictionary or None on error
+            List of response dictionaries in command order (None on error)
         """
+        if not commands:
+            return []
+
+        if not self.tcp_socket:
+            if not self.connect_tcp():
+                return [None] * len(commands)
+
+        responses: List[Optional[Dict[str, Any]]] = []
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(2.0)
+            # Send all commands back-to-back
+            payload = b''.join(_dumps(c) + b'\n' for c in commands)
+            self.tcp_socket.sendall(payload)
 
-            # Send command
-            cmd_str = json.dumps(command)
-            sock.sendto(cmd_str.encode(), (self.host, self.udp_port))
+            # Firmware answers each command with one JSON line, in order
+            while len(responses) < len(commands):
+                line = self._read_line().strip()
+                if line.startswith(b'{'):
+                    responses.append(_loads(line))
 
-            # Receive response
-            response, addr = sock.recvfrom(4096)
-            sock.close()
+        except Exception as e:
+            if self.verbose:
+                print(f"✗ TCP batch error: {e}")
+            self._close_tcp()
+
+        return responses + [None] * (len(commands) - len(responses))
+
+    def send_udp_batch(self, commands: List[Dict[str, Any]], timeout: float = 2.0) -> List[Dict[str, Any]]:
+        """
+        Fire several commands over UDP, then collect the replies.
+
+        Args:
+            commands: List of command dictionaries
+            timeout: Time to wait for all replies in seconds
+
+        Returns:
+            List of response dictionaries in arrival order (lost replies are
+            simply missing)
+        """
+        responses: List[Dict[str, Any]] = []
+        if not commands:
+            return responses
+
+        try:
+            with self._udp_lock:
+                sock = self._get_udp_sock()
+                if self._udp_stale:
+                    self._drain_udp(sock)
 
-            return json.loads(response.decode())
+                try:
+                    for command in commands:
+                        sock.send(_dumps(command))
+
+                    deadline = time.monotonic() + timeout
+                    while len(responses) < len(commands):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        sock.settimeout(remaining)
+                        try:
+                            data = sock.recv(4096)
+                        except socket.timeout:
+                            break
+                        try:
+                            responses.append(_loads(data))
+                        except ValueError:
+                            continue
+                finally:
+                    sock.settimeout(2.0)
+                    if len(responses) < len(commands):
+                        self._udp_stale = True  # Lost replies may still arrive
 
         except Exception as e:
             if self.verbose:
-                print(f"✗ UDP send error: {e}")
-            return None
+                print(f"✗ UDP batch error: {e}")
+
+        return responses
 
     # Convenience methods
 
@@ -422,9 +1230,8 @@ class ESP32Controller:
         """Set pin to HIGH (1) or LOW (0)."""
         if self.verbose:
             print(f"Setting pin {pin} to {'HIGH' if value else 'LOW'}...")
-        command = {"cmd": "SET", "pin": pin, "value": value}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _encode("SET", pin, value)) if use_tcp else self._send_pin_udp("SET", pin, value)
         success = response and response.get("success", False)
         if self.verbose:
             if success:
@@ -437,9 +1244,8 @@ class ESP32Controller:
         """Get current pin state."""
         if self.verbose:
             print(f"Reading pin {pin}...")
-        command = {"cmd": "GET", "pin": pin}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _encode("GET", pin)) if use_tcp else self._send_pin_udp("GET", pin)
         if response and response.get("success"):
             value = response.get("value")
             if self.verbose:
@@ -453,9 +1259,8 @@ class ESP32Controller:
         """Toggle pin state."""
         if self.verbose:
             print(f"Toggling pin {pin}...")
-        command = {"cmd": "TOGGLE", "pin": pin}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _encode("TOGGLE", pin)) if use_tcp else self._send_pin_udp("TOGGLE", pin)
         success = response and response.get("success", False)
         if self.verbose:
             if success:
@@ -470,9 +1275,8 @@ class ESP32Controller:
         """Set PWM value (0-255)."""
         if self.verbose:
             print(f"Setting pin {pin} PWM to {value}...")
-        command = {"cmd": "PWM", "pin": pin, "value": value}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _encode("PWM", pin, value)) if use_tcp else self._send_pin_udp("PWM", pin, value)
         success = response and response.get("success", False)
         if self.verbose:
             if success:
@@ -481,13 +1285,151 @@ class ESP32Controller:
                 print(f"  ✗ Failed to set PWM")
         return success
 
+    def batch(self, ops: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run several SET/GET/TOGGLE/PWM commands on the ESP32 in one round-trip.
+
+        Args:
+            ops: List of command dictionaries, e.g. {"cmd": "SET", "pin": 13, "value": 1}
+
+        Returns:
+            List of response dictionaries in op order (None on error). If
+            the firmware rejects a batch (e.g. for one invalid op), none of
+            its ops run and each gets the rejection.
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        for i in range(0, len(ops), self._MAX_BATCH_OPS):
+            chunk = ops[i:i + self._MAX_BATCH_OPS]
+            response = self.send_tcp({"cmd": "BATCH", "ops": chunk})
+            if response and response.get("command") == "BATCH":
+                results.extend(response.get("results", []))
+            elif response is not None and self._unknown_command(response, "BATCH"):
+                # Firmware without BATCH support: pipeline the ops so each
+                # gets its own reply
+                results.extend(self.send_tcp_batch(chunk))
+            else:
+                results.extend([response] * len(chunk))
+        return results
+
+    @staticmethod
+    def _unknown_command(response: Dict[str, Any], cmd: str) -> bool:
+        """True if response is firmware too old to know cmd rejecting it."""
+        return (not response.get("success")
+                and response.get("message") == f"Invalid command type: {cmd}")
+
+    def set_pins(self, pairs: List[Tuple[int, int]]) -> bool:
+        """Set several pins to HIGH (1) or LOW (0) in one round-trip."""
+        if self.verbose:
+            print(f"Setting {len(pairs)} pins...")
+        responses = self.batch(
+            [{"cmd": "SET", "pin": pin, "value": value} for pin, value in pairs])
+        success = all(r and r.get("success") for r in responses)
+        if self.verbose:
+            if success:
+                print(f"  ✓ {len(pairs)} pins set")
+            else:
+                print(f"  ✗ Failed to set pins")
+        return success
+
+    def pwm_ramp(self, pin: int, start: int, stop: int, step: int = 1, delay_ms: int = 0) -> bool:
+        """
+        Fade a pin's PWM value from start to stop on the ESP32 in one round-trip.
+
+        The value changes by step per write (finishing exactly on stop) with
+        delay_ms between writes.
+        """
+        if self.verbose:
+            print(f"Ramping pin {pin} PWM {start} -> {stop}...")
+        command = {"cmd": "PWM_RAMP", "pin": pin, "from": start, "to": stop,
+                   "step": step, "delay_ms": delay_ms}
+        # The reply only comes once the ramp has finished
+        values = self._ramp_values(start, stop, step)
+        duration = (len(values) - 1) * delay_ms / 1000.0
+        response = self.send_tcp(command, timeout=duration + 1.0)
+        if response is not None and self._unknown_command(response, "PWM_RAMP"):
+            # Firmware without PWM_RAMP support: step it from the client,
+            # on absolute ticks so command latency doesn't stretch the fade
+            success = True
+            start_time = time.monotonic()
+            for i, value in enumerate(values):
+                deadline_sleep(start_time + i * delay_ms / 1000.0)
+                if not self.set_pwm(pin, value):
+                    success = False
+                    break
+        else:
+            # Includes a ramp the firmware rejected (e.g. over its duration limit)
+            success = bool(response and response.get("success"))
+        if self.verbose:
+            if success:
+                print(f"  ✓ PWM ramped to {stop}")
+            else:
+                print(f"  ✗ Failed to ramp PWM")
+        return success
+
+    @staticmethod
+    def _ramp_values(start: int, stop: int, step: int) -> List[int]:
+        """PWM values written by a ramp, matching the firmware's PWM_RAMP."""
+        step = max(1, step)
+        values = list(range(start, stop, step if stop >= start else -step))
+        values.append(stop)
+        return values
+
+    def run_sequence(self, steps: List[Dict[str, int]]) -> bool:
+        """
+        Run a timed sequence of digital writes on the ESP32 in one round-trip.
+
+        Args:
+            steps: List of {"pin": int, "value": 0|1, "delay_ms": int} dicts;
+                delay_ms is the wait after the step (default 0)
+
+        Returns:
+            True if every step succeeded
+        """
+        if self.verbose:
+            print(f"Running sequence of {len(steps)} steps...")
+        # The reply only comes once the whole sequence has run
+        duration = sum(step.get("delay_ms", 0) for step in steps) / 1000.0
+        response = self.send_tcp({"cmd": "SEQ", "steps": steps},
+                                 timeout=duration + 1.0)
+        if response is not None and self._unknown_command(response, "SEQ"):
+            # Firmware without SEQ support: replay it from the client,
+            # pipelining every run of steps that has no delay between them
+            success = self._run_sequence_locally(steps)
+        else:
+            # Includes a sequence the firmware rejected (e.g. too long)
+            success = bool(response and response.get("success"))
+        if self.verbose:
+            if success:
+                print("  ✓ Sequence complete")
+            else:
+                print("  ✗ Sequence failed")
+        return success
+
+    def _run_sequence_locally(self, steps: List[Dict[str, int]]) -> bool:
+        """Client-side fallback for run_sequence."""
+        pending: List[Dict[str, Any]] = []
+        success = True
+        next_tick = time.monotonic()
+        for i, step in enumerate(steps):
+            pending.append(
+                {"cmd": "SET", "pin": step["pin"], "value": step["value"]})
+            delay_ms = step.get("delay_ms", 0)
+            if delay_ms > 0 or i == len(steps) - 1:
+                responses = self.send_tcp_batch(pending)
+                pending = []
+                if not all(r and r.get("success") for r in responses):
+                    success = False
+                    break
+                next_tick += delay_ms / 1000.0
+                deadline_sleep(next_tick)
+        return success
+
     def get_status(self, use_tcp: bool = True) -> Optional[Dict[str, Any]]:
         """Get system status."""
         if self.verbose:
             print("Getting system status...")
-        command = {"cmd": "STATUS"}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _STATUS_CMD_NL) if use_tcp else self._send_bytes_udp(_STATUS_CMD)
         if self.verbose:
             if response:
                 print("  ✓ Status received")
@@ -502,10 +1444,377 @@ class ESP32Controller:
         """Restart the ESP32."""
         if self.verbose:
             print("Sending restart command to ESP32...")
-        command = {"cmd": "RESET"}
-        response = self.send_tcp(
-            command) if use_tcp else self.send_udp(command)
+        response = self._send_bytes_tcp(
+            _RESET_CMD_NL) if use_tcp else self._send_bytes_udp(_RESET_CMD)
         success = response and response.get("success", False)
         if self.verbose and success:
             print("  ✓ Restart command sent")
         return success
+
+
+class _UDPReplies(asyncio.DatagramProtocol):
+    """
+    Hands each UDP reply from one ESP32 to the request awaiting it.
+
+    Replies carry no request id, so a reply goes to the oldest request for
+    the same (command, pin). An "INVALID" reply names no command, so it goes
+    to the only outstanding request, if there is just one. Anything else
+    (e.g. a late reply to a request that timed out) is discarded.
+    """
+
+    def __init__(self):
+        self.pending: List[Tuple[Tuple[Any, Any], asyncio.Future]] = []
+
+    def expect(self, key: Tuple[Any, Any]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((key, future))
+        return future
+
+    def forget(self, future: asyncio.Future):
+        """Stop routing replies to a request that has given up waiting."""
+        self.pending = [p for p in self.pending if p[1] is not future]
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            reply = _loads(data)
+        except ValueError:
+            return
+        if not isinstance(reply, dict):
+            return
+        self.pending = [p for p in self.pending if not p[1].done()]
+        key = (reply.get("command"), reply.get("pin"))
+        match = next((p for p in self.pending if p[0] == key), None)
+        if match is None and key[0] == "INVALID" and len(self.pending) == 1:
+            match = self.pending[0]
+        if match is not None:
+            self.pending.remove(match)
+            match[1].set_result(reply)
+
+    def error_received(self, exc: Exception):
+        # e.g. ICMP port unreachable: nothing outstanding will be answered
+        for _, future in self.pending:
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+class _DiscoveryReplies(asyncio.DatagramProtocol):
+    """Collects the devices answering an async discovery broadcast."""
+
+    def __init__(self):
+        self.devices: List[Tuple[str, Dict[str, Any]]] = []
+        self.seen = set()
+        self.last_new = 0.0
+        self.new_device = asyncio.Event()  # Set on each new device
+
+    def datagram_received(self, data: bytes, addr):
+        ip = addr[0]
+        if ip in self.seen:
+            return
+        self.seen.add(ip)
+        try:
+            response = _loads(data)
+        except ValueError:
+            return
+        if isinstance(response, dict) and response.get("success"):
+            self.devices.append((ip, response))
+            self.last_new = asyncio.get_running_loop().time()
+            self.new_device.set()
+
+
+class AsyncESP32Controller:
+    """
+    asyncio client for one ESP32, for driving several devices at once.
+
+    TCP commands on one controller run one at a time; UDP commands may
+    overlap. Gather calls on several controllers (or several UDP commands)
+    to fan out in about one round-trip:
+
+        ctrls = [AsyncESP32Controller(ip) for ip in ips]
+        await asyncio.gather(*(c.set_pin(13, 1) for c in ctrls))
+    """
+
+    def __init__(self, host: str, tcp_port: int = 8888, udp_port: int = 8889,
+                 verbose: bool = False):
+        self.host = host
+        self.tcp_port = tcp_port
+        self.udp_port = udp_port
+        self.verbose = verbose
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._udp_transport: Optional[asyncio.DatagramTransport] = None
+        self._udp: Optional[_UDPReplies] = None
+        # Created on first use, inside the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._udp_lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    async def discover_devices(timeout: float = 3.0,
+                               udp_port: int = 8889) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Discover ESP32 devices on the local network using UDP broadcast.
+
+        Same schedule and early stop as ESP32Controller.discover_devices
+        (without its unicast sweep fallback), but awaitable.
+
+        Returns:
+            List of tuples (ip_address, status_info)
+        """
+        loop = asyncio.get_running_loop()
+        transport, replies = await loop.create_datagram_endpoint(
+            _DiscoveryReplies, local_addr=("0.0.0.0", 0), allow_broadcast=True)
+        try:
+            start = loop.time()
+            deadline = start + timeout
+            broadcasts = [start + offset + random.uniform(-jitter, jitter)
+                          for offset, jitter in ESP32Controller._DISCOVERY_BROADCASTS]
+            while True:
+                now = loop.time()
+                if broadcasts and now >= broadcasts[0]:
+                    transport.sendto(_STATUS_CMD, ("<broadcast>", udp_port))
+                    broadcasts.pop(0)
+                end = deadline
+                if replies.devices:
+                    end = min(end, replies.last_new + ESP32Controller._DISCOVERY_IDLE)
+                if now >= end:
+                    break
+                if broadcasts:
+                    end = min(end, broadcasts[0])
+                # Wake for the next broadcast, the end, or a new device
+                # (which moves the idle cut-off)
+                replies.new_device.clear()
+                try:
+                    await asyncio.wait_for(replies.new_device.wait(), end - now)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            transport.close()
+        return replies.devices
+
+    async def __aenter__(self) -> "AsyncESP32Controller":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self) -> bool:
+        """Establish TCP connection to ESP32."""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.tcp_port),
+                ESP32Controller._TCP_CONNECT_TIMEOUT)
+            sock = self._writer.get_extra_info('socket')
+            if sock is not None:
+                _tune_tcp(sock)
+
+            # Discard the welcome banner: wait for its first line, then take
+            # lines until the connection goes quiet
+            line = await asyncio.wait_for(
+                self._reader.readline(), ESP32Controller._TCP_BANNER_TIMEOUT)
+            while line:
+                if self.verbose and line.strip():
+                    print(f"Connected: {line.decode(errors='replace').strip()}")
+                try:
+                    line = await asyncio.wait_for(
+                        self._reader.readline(), ESP32Controller._TCP_BANNER_QUIET)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                raise ConnectionError("Connection closed")
+
+            if self.verbose:
+                print(f"✓ TCP connection established to {self.host}:{self.tcp_port}")
+            return True
+
+        except Exception as e:
+            if self.verbose:
+                print(f"✗ TCP connection failed to {self.host}: {e}")
+            await self.close()
+            return False
+
+    async def close(self):
+        """Close the TCP connection and the UDP endpoint."""
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = self._udp = None
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def send_tcp(self, command: Dict[str, Any],
+                       timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send command via TCP and get response.
+
+        Args:
+            command: Command dictionary
+            timeout: Reply timeout in seconds for slow commands (optional)
+
+        Returns:
+            Response dictionary or None on error
+        """
+        return await self._send_bytes_tcp(_dumps(command) + b'\n', timeout=timeout)
+
+    async def _send_bytes_tcp(self, payload: bytes,
+                              timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send an already-encoded command line and get response.
+
+        Like ESP32Controller._send_bytes_tcp, a broken connection is
+        reopened and the command retried once; a reply timeout is not.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for attempt in range(2):
+                if self._writer is None and not await self.connect():
+                    return None
+                try:
+                    self._writer.write(payload)
+                    await self._writer.drain()
+                    return await asyncio.wait_for(
+                        self._read_json_response(),
+                        ESP32Controller._TCP_IO_TIMEOUT if timeout is None else timeout)
+                except asyncio.TimeoutError:
+                    if self.verbose:
+                        print(f"✗ TCP reply timed out from {self.host}")
+                except ValueError as e:
+                    if self.verbose:
+                        print(f"✗ JSON parse error: {e}")
+                except (OSError, EOFError) as e:
+                    if self.verbose:
+                        print(f"✗ TCP send error: {e}")
+                    if attempt == 0:
+                        await self.close()
+                        continue
+                # The stream may now be out of step with our commands
+                await self.close()
+                return None
+        return None
+
+    async def _read_json_response(self) -> Dict[str, Any]:
+        """Return the next JSON reply line, skipping blank and plain-text lines."""
+        while True:
+            line = (await self._reader.readuntil(b'\n')).strip()
+            if line.startswith(b'{'):
+                return _loads(line)
+
+    async def send_udp(self, command: Dict[str, Any],
+                       timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """
+        Send command via UDP and get response.
+
+        Args:
+            command: Command dictionary
+            timeout: Reply timeout in seconds
+
+        Returns:
+            Response dictionary or None on error
+        """
+        key = (str(command.get("cmd", "")).upper(), command.get("pin"))
+        return await self._send_bytes_udp(_dumps(command), key, timeout)
+
+    async def _send_bytes_udp(self, payload: bytes, key: Tuple[Any, Any],
+                              timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Send an already-encoded command via UDP and await its reply."""
+        try:
+            if self._udp_lock is None:
+                self._udp_lock = asyncio.Lock()
+            async with self._udp_lock:
+                if self._udp is None:
+                    # Connected to the ESP32, like ESP32Controller's UDP socket
+                    self._udp_transport, self._udp = \
+                        await asyncio.get_running_loop().create_datagram_endpoint(
+                            _UDPReplies, remote_addr=(self.host, self.udp_port))
+            reply = self._udp.expect(key)
+            try:
+                self._udp_transport.sendto(payload)
+                return await asyncio.wait_for(reply, timeout)
+            finally:
+                self._udp.forget(reply)
+        except asyncio.TimeoutError:
+            if self.verbose:
+                print(f"✗ UDP reply timed out from {self.host}")
+        except OSError as e:
+            if self.verbose:
+                print(f"✗ UDP send error: {e}")
+        return None
+
+    # Convenience methods
+
+    async def _send_pin(self, cmd: str, pin: int, value: Optional[int],
+                        use_tcp: bool) -> Optional[Dict[str, Any]]:
+        payload = _encode(cmd, pin, value)
+        if use_tcp:
+            return await self._send_bytes_tcp(payload)
+        return await self._send_bytes_udp(payload, (cmd, pin))
+
+    async def set_pin(self, pin: int, value: int, use_tcp: bool = True) -> bool:
+        """Set pin to HIGH (1) or LOW (0)."""
+        response = await self._send_pin("SET", pin, value, use_tcp)
+        return bool(response and response.get("success", False))
+
+    async def get_pin(self, pin: int, use_tcp: bool = True) -> Optional[int]:
+        """Get current pin state."""
+        response = await self._send_pin("GET", pin, None, use_tcp)
+        if response and response.get("success"):
+            return response.get("value")
+        return None
+
+    async def toggle_pin(self, pin: int, use_tcp: bool = True) -> bool:
+        """Toggle pin state."""
+        response = await self._send_pin("TOGGLE", pin, None, use_tcp)
+        return bool(response and response.get("success", False))
+
+    async def set_pwm(self, pin: int, value: int, use_tcp: bool = True) -> bool:
+        """Set PWM value (0-255)."""
+        response = await self._send_pin("PWM", pin, value, use_tcp)
+        return bool(response and response.get("success", False))
+
+    async def batch(self, ops: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run several SET/GET/TOGGLE/PWM commands on the ESP32 in one round-trip.
+
+        Args:
+            ops: List of command dictionaries, e.g. {"cmd": "SET", "pin": 13, "value": 1}
+
+        Returns:
+            List of response dictionaries in op order (None on error). If
+            the firmware rejects a batch (e.g. for one invalid op), none of
+            its ops run and each gets the rejection.
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        for i in range(0, len(ops), ESP32Controller._MAX_BATCH_OPS):
+            chunk = ops[i:i + ESP32Controller._MAX_BATCH_OPS]
+            response = await self.send_tcp({"cmd": "BATCH", "ops": chunk})
+            if response and response.get("command") == "BATCH":
+                results.extend(response.get("results", []))
+            elif response is not None and ESP32Controller._unknown_command(response, "BATCH"):
+                # Firmware without BATCH support
+                for op in chunk:
+                    results.append(await self.send_tcp(op))
+            else:
+                results.extend([response] * len(chunk))
+        return results
+
+    async def reset_pins(self) -> bool:
+        """Reset all pins to LOW (0)."""
+        response = await self._send_bytes_tcp(_RESET_PINS_CMD_NL)
+        return bool(response and response.get("success", False))
+
+    async def get_status(self, use_tcp: bool = True) -> Optional[Dict[str, Any]]:
+        """Get system status."""
+        if use_tcp:
+            return await self._send_bytes_tcp(_STATUS_CMD_NL)
+        return await self._send_bytes_udp(_STATUS_CMD, ("STATUS", None))
+
+    async def reset(self) -> bool:
+        """Restart the ESP32."""
+        response = await self._send_bytes_tcp(_RESET_CMD_NL)
+        return bool(response and response.get("success", False))
@@ -3,6 +3,7 @@
 
 #include <Arduino.h>
 #include <ArduinoJson.h>
+#include <vector>
 #include "Config.h"
 
 /**
@@ -17,6 +18,9 @@
  * {"cmd":"PWM","pin":13,"value":128}
  * {"cmd":"STATUS"}
  * {"cmd":"RESET"}
+ * {"cmd":"SEQ","steps":[{"pin":13,"value":1,"delay_ms":100},...]}
+ * {"cmd":"PWM_RAMP","pin":13,"from":0,"to":255,"step":32,"delay_ms":100}
+ * {"cmd":"BATCH","ops":[{"cmd":"SET","pin":13,"value":1},{"cmd":"GET","pin":14}]}
  *
  * Text Format:
  * SET 13 1
@@ -25,6 +29,8 @@
  * PWM 13 128
  * STATUS
  * RESET
+ *
+ * SEQ, PWM_RAMP and BATCH are only available in JSON format.
  */
 
 enum class CommandType
@@ -37,17 +43,40 @@ enum class CommandType
     STATUS,     // Get system status
     RESET,      // Reset/restart system
     RESET_PINS, // Reset all pins to LOW
+    SEQ,        // Run a timed sequence of digital writes
+    PWM_RAMP,   // Fade PWM value from one level to another
+    BATCH,      // Run several pin commands, one reply for all
     HELP        // Get help information
 };
 
+struct SequenceStep
+{
+    int pin;
+    int value;   // 0 or 1
+    int delayMs; // Wait after writing, before the next step
+};
+
+struct PinOp
+{
+    CommandType type; // SET, GET, TOGGLE or PWM
+    int pin;
+    int value;
+};
+
 struct Command
 {
     CommandType type;
     int pin;
     int value;
+    std::vector<SequenceStep> steps; // SEQ only
+    std::vector<PinOp> ops;          // BATCH only
+    int rampFrom;                    // PWM_RAMP only (value is the target)
+    int rampStep;
+    int rampDelayMs;
     String errorMessage;
 
-    Command() : type(CommandType::INVALID), pin(-1), value(-1), errorMessage("") {}
+    Command() : type(CommandType::INVALID), pin(-1), value(-1),
+                rampFrom(0), rampStep(1), rampDelayMs(0), errorMessage("") {}
 
     bool isValid() const
     {
@@ -72,6 +72,16 @@ const int SAFE_PINS[] = {
 
 const int SAFE_PIN_COUNT = sizeof(SAFE_PINS) / sizeof(int);
 
+// Maximum number of steps in a single SEQ command
+#define MAX_SEQUENCE_STEPS 64
+
+// Maximum number of operations in a single BATCH command
+#define MAX_BATCH_OPS 32
+
+// Maximum total delay of a single SEQ command (milliseconds)
+// The server handles no other commands while a sequence runs
+#define MAX_SEQUENCE_DURATION 5000
+
 // Pin state persistence interval (milliseconds)
 // Set to 0 to disable state persistence
 #define PIN_STATE_SAVE_INTERVAL 60000
@@ -98,6 +108,9 @@ const int SAFE_PIN_COUNT = sizeof(SAFE_PINS) / sizeof(int);
 // Device hostname (for mDNS)
 #define DEVICE_HOSTNAME "esp32-controller"
 
+// mDNS service advertised for the UDP command server (_esp32._udp.local)
+#define MDNS_SERVICE_NAME "esp32"
+
 // Status LED pin (set to -1 to disable)
 #define STATUS_LED_PIN 2
 
@@ -14,6 +14,7 @@
  * Features:
  * - TCP server for reliable command delivery
  * - UDP server for fast, connectionless commands
+ *   (JSON/text, or 3-byte binary pin commands: [opcode, pin, value] -> [success, value])
  * - Multiple simultaneous TCP client support
  * - Command processing and response generation
  */
@@ -42,9 +43,27 @@ private:
     // Handle UDP packets
     void handleUDP();
 
+    // Execute a binary UDP pin command and send the 2-byte reply
+    void handleBinaryUDP(const uint8_t *packet);
+
     // Process a command and generate response
     String processCommand(const String &commandStr);
 
+    // Execute a SET, GET, TOGGLE or PWM command
+    bool executePinCommand(const Command &cmd, String &message, int &resultValue);
+
+    // Execute BATCH ops in order and build the combined response
+    String runBatch(const Command &cmd);
+
+    // Execute SEQ steps in order, honouring each step's delay
+    bool runSequence(const std::vector<SequenceStep> &steps);
+
+    // Step a pin's PWM value from rampFrom to value, delaying between writes
+    bool runPWMRamp(const Command &cmd);
+
+    // Delay while keeping the watchdog fed
+    void delayWithWatchdog(unsigned long ms);
+
     // Generate status response
     String generateStatusResponse();
 
@@ -57,6 +76,14 @@ private:
 
     unsigned long _lastClientCheck;
     static const unsigned long CLIENT_CHECK_INTERVAL = 1000;
+
+    // Binary UDP opcodes (below any printable character, so they never
+    // collide with JSON or text commands)
+    static const uint8_t BINARY_OP_SET = 0x01;
+    static const uint8_t BINARY_OP_GET = 0x02;
+    static const uint8_t BINARY_OP_TOGGLE = 0x03;
+    static const uint8_t BINARY_OP_PWM = 0x04;
+    static const int BINARY_PACKET_SIZE = 3;
 };
 
 #endif // NETWORK_SERVER_H
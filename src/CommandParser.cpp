@@ -108,6 +108,155 @@ Command CommandParser::parseJSON(const String &jsonString)
         }
         break;
 
+    case CommandType::SEQ:
+    {
+        if (!doc["steps"].is<JsonArray>())
+        {
+            cmd.errorMessage = "Missing 'steps' array";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+
+        JsonArray steps = doc["steps"].as<JsonArray>();
+        if (steps.size() == 0 || steps.size() > MAX_SEQUENCE_STEPS)
+        {
+            cmd.errorMessage = "SEQ must have 1-" + String(MAX_SEQUENCE_STEPS) + " steps";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+
+        unsigned long totalDelay = 0;
+        for (JsonObject stepObj : steps)
+        {
+            SequenceStep step;
+            step.pin = stepObj["pin"] | -1;
+            step.value = stepObj["value"] | -1;
+            step.delayMs = stepObj["delay_ms"] | 0;
+
+            if (!isValidPin(step.pin))
+            {
+                cmd.errorMessage = "Invalid pin number in step: " + String(step.pin);
+                cmd.type = CommandType::INVALID;
+                return cmd;
+            }
+            if (step.value != 0 && step.value != 1)
+            {
+                cmd.errorMessage = "Step value must be 0 or 1";
+                cmd.type = CommandType::INVALID;
+                return cmd;
+            }
+            if (step.delayMs < 0)
+            {
+                cmd.errorMessage = "Step delay_ms must not be negative";
+                cmd.type = CommandType::INVALID;
+                return cmd;
+            }
+
+            totalDelay += step.delayMs;
+            cmd.steps.push_back(step);
+        }
+
+        if (totalDelay > MAX_SEQUENCE_DURATION)
+        {
+            cmd.errorMessage = "SEQ total delay exceeds " + String(MAX_SEQUENCE_DURATION) + " ms";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+        break;
+    }
+
+    case CommandType::BATCH:
+    {
+        if (!doc["ops"].is<JsonArray>())
+        {
+            cmd.errorMessage = "Missing 'ops' array";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+
+        JsonArray ops = doc["ops"].as<JsonArray>();
+        if (ops.size() == 0 || ops.size() > MAX_BATCH_OPS)
+        {
+            cmd.errorMessage = "BATCH must have 1-" + String(MAX_BATCH_OPS) + " ops";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+
+        // Validate every op up front so a bad one rejects the whole batch
+        for (JsonObject opObj : ops)
+        {
+            String opString;
+            serializeJson(opObj, opString);
+            Command op = parseJSON(opString);
+
+            if (!op.isValid())
+            {
+                cmd.errorMessage = "Invalid op in batch: " + op.errorMessage;
+                cmd.type = CommandType::INVALID;
+                return cmd;
+            }
+            if (op.type != CommandType::SET && op.type != CommandType::GET &&
+                op.type != CommandType::TOGGLE && op.type != CommandType::PWM)
+            {
+                cmd.errorMessage = "BATCH ops must be SET, GET, TOGGLE or PWM";
+                cmd.type = CommandType::INVALID;
+                return cmd;
+            }
+
+            PinOp pinOp;
+            pinOp.type = op.type;
+            pinOp.pin = op.pin;
+            pinOp.value = op.value;
+            cmd.ops.push_back(pinOp);
+        }
+        break;
+    }
+
+    case CommandType::PWM_RAMP:
+    {
+        if (!doc.containsKey("pin") || !doc.containsKey("from") || !doc.containsKey("to"))
+        {
+            cmd.errorMessage = "PWM_RAMP requires 'pin', 'from' and 'to' fields";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+        cmd.pin = doc["pin"];
+        cmd.rampFrom = doc["from"];
+        cmd.value = doc["to"];
+        cmd.rampStep = doc["step"] | 1;
+        cmd.rampDelayMs = doc["delay_ms"] | 0;
+
+        if (!isValidPin(cmd.pin))
+        {
+            cmd.errorMessage = "Invalid pin number: " + String(cmd.pin);
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+        if (cmd.rampFrom < 0 || cmd.rampFrom > 255 || cmd.value < 0 || cmd.value > 255)
+        {
+            cmd.errorMessage = "PWM_RAMP 'from' and 'to' must be 0-255";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+        if (cmd.rampStep < 1 || cmd.rampDelayMs < 0)
+        {
+            cmd.errorMessage = "PWM_RAMP 'step' must be >= 1 and 'delay_ms' >= 0";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+
+        // One delay between each pair of consecutive writes
+        int span = abs(cmd.value - cmd.rampFrom);
+        unsigned long totalDelay = (unsigned long)((span + cmd.rampStep - 1) / cmd.rampStep) * cmd.rampDelayMs;
+        if (totalDelay > MAX_SEQUENCE_DURATION)
+        {
+            cmd.errorMessage = "PWM_RAMP total delay exceeds " + String(MAX_SEQUENCE_DURATION) + " ms";
+            cmd.type = CommandType::INVALID;
+            return cmd;
+        }
+        break;
+    }
+
     case CommandType::STATUS:
     case CommandType::RESET:
     case CommandType::RESET_PINS:
@@ -225,6 +374,13 @@ Command CommandParser::parseText(const String &textString)
         break;
     }
 
+    case CommandType::SEQ:
+    case CommandType::PWM_RAMP:
+    case CommandType::BATCH:
+        cmd.errorMessage = cmdStr + " is only supported in JSON format";
+        cmd.type = CommandType::INVALID;
+        return cmd;
+
     case CommandType::STATUS:
     case CommandType::RESET:
     case CommandType::RESET_PINS:
@@ -282,7 +438,10 @@ String CommandParser::getHelpText()
     help += "  Toggle pin: {\"cmd\":\"TOGGLE\",\"pin\":13}\n";
     help += "  PWM:        {\"cmd\":\"PWM\",\"pin\":13,\"value\":128}\n";
     help += "  Status:     {\"cmd\":\"STATUS\"}\n";
-    help += "  Reset:      {\"cmd\":\"RESET\"}\n\n";
+    help += "  Reset:      {\"cmd\":\"RESET\"}\n";
+    help += "  Sequence:   {\"cmd\":\"SEQ\",\"steps\":[{\"pin\":13,\"value\":1,\"delay_ms\":100}]}\n";
+    help += "  PWM ramp:   {\"cmd\":\"PWM_RAMP\",\"pin\":13,\"from\":0,\"to\":255,\"step\":32,\"delay_ms\":100}\n";
+    help += "  Batch:      {\"cmd\":\"BATCH\",\"ops\":[{\"cmd\":\"SET\",\"pin\":13,\"value\":1}]}\n\n";
     help += "Text Format:\n";
     help += "  Set pin:    SET 13 1\n";
     help += "  Get pin:    GET 13\n";
@@ -329,6 +488,12 @@ CommandType CommandParser::stringToCommandType(const String &cmdStr)
         return CommandType::RESET;
     if (cmdStr == "RESET_PINS")
         return CommandType::RESET_PINS;
+    if (cmdStr == "SEQ")
+        return CommandType::SEQ;
+    if (cmdStr == "PWM_RAMP")
+        return CommandType::PWM_RAMP;
+    if (cmdStr == "BATCH")
+        return CommandType::BATCH;
     if (cmdStr == "HELP")
         return CommandType::HELP;
     return CommandType::INVALID;
@@ -352,6 +517,12 @@ String CommandParser::commandTypeToString(CommandType type)
         return "RESET";
     case CommandType::RESET_PINS:
         return "RESET_PINS";
+    case CommandType::SEQ:
+        return "SEQ";
+    case CommandType::PWM_RAMP:
+        return "PWM_RAMP";
+    case CommandType::BATCH:
+        return "BATCH";
     case CommandType::HELP:
         return "HELP";
     default:
@@ -2,6 +2,7 @@
 #include "WiFiManager.h"
 #include "WatchdogManager.h"
 #include <ArduinoJson.h>
+#include <ESPmDNS.h>
 
 // External references to global instances
 extern WiFiManager wifiManager;
@@ -36,6 +37,24 @@ void NetworkServer::begin()
     {
 #if ENABLE_SERIAL_DEBUG
         Serial.println("[Server] Failed to start UDP server");
+#endif
+    }
+
+    // Advertise hostname and command service over mDNS
+    // (restart cleanly when the server is recreated after a WiFi reconnect)
+    MDNS.end();
+    if (MDNS.begin(DEVICE_HOSTNAME))
+    {
+        MDNS.addService(MDNS_SERVICE_NAME, "udp", UDP_SERVER_PORT);
+#if ENABLE_SERIAL_DEBUG
+        Serial.printf("[Server] mDNS responder started: %s.local (_%s._udp)\n",
+                      DEVICE_HOSTNAME, MDNS_SERVICE_NAME);
+#endif
+    }
+    else
+    {
+#if ENABLE_SERIAL_DEBUG
+        Serial.println("[Server] Failed to start mDNS responder");
 #endif
     }
 }
@@ -69,9 +88,9 @@ void NetworkServer::handleTCPClients()
                 Serial.printf("[Server] New TCP client connected (slot %d)\n", i);
 #endif
 
-                // Send welcome message
-                _tcpClients[i].println("ESP32 Pin Controller Ready");
-                _tcpClients[i].println("Type HELP for command list");
+                // Send welcome message (one write, so one segment)
+                _tcpClients[i].print("ESP32 Pin Controller Ready\r\n"
+                                     "Type HELP for command list\r\n");
 
                 slotFound = true;
                 break;
@@ -108,8 +127,11 @@ void NetworkServer::handleTCPClients()
                     Serial.printf("[Server] TCP command from client %d: %s\n", i, command.c_str());
 #endif
 
+                    // println() would write the line ending as a second
+                    // tiny segment; send the reply in a single write
                     String response = processCommand(command);
-                    _tcpClients[i].println(response);
+                    response += "\r\n";
+                    _tcpClients[i].print(response);
                 }
             }
         }
@@ -133,6 +155,15 @@ void NetworkServer::handleUDP()
     {
         char packet[COMMAND_BUFFER_SIZE];
         int len = _udp.read(packet, COMMAND_BUFFER_SIZE - 1);
+
+        // Binary pin commands skip the parser entirely
+        uint8_t opcode = (uint8_t)packet[0];
+        if (len == BINARY_PACKET_SIZE && opcode >= BINARY_OP_SET && opcode <= BINARY_OP_PWM)
+        {
+            handleBinaryUDP((const uint8_t *)packet);
+            return;
+        }
+
         packet[len] = '\0';
 
         String command = String(packet);
@@ -154,6 +185,44 @@ void NetworkServer::handleUDP()
     }
 }
 
+void NetworkServer::handleBinaryUDP(const uint8_t *packet)
+{
+    Command cmd;
+    switch (packet[0])
+    {
+    case BINARY_OP_SET:
+        cmd.type = CommandType::SET;
+        break;
+    case BINARY_OP_GET:
+        cmd.type = CommandType::GET;
+        break;
+    case BINARY_OP_TOGGLE:
+        cmd.type = CommandType::TOGGLE;
+        break;
+    default:
+        cmd.type = CommandType::PWM;
+        break;
+    }
+    cmd.pin = packet[1];
+    cmd.value = packet[2];
+
+    // PinController validates the pin and value
+    String message = "";
+    int resultValue = -1;
+    bool success = executePinCommand(cmd, message, resultValue);
+
+#if ENABLE_SERIAL_DEBUG
+    Serial.printf("[Server] Binary UDP command %d pin %d value %d: %s\n",
+                  packet[0], cmd.pin, cmd.value, message.c_str());
+#endif
+
+    uint8_t reply[2] = {(uint8_t)(success ? 1 : 0),
+                        (uint8_t)(resultValue >= 0 ? resultValue : 0)};
+    _udp.beginPacket(_udp.remoteIP(), _udp.remotePort());
+    _udp.write(reply, sizeof(reply));
+    _udp.endPacket();
+}
+
 String NetworkServer::processCommand(const String &commandStr)
 {
     // Parse the command
@@ -169,6 +238,66 @@ String NetworkServer::processCommand(const String &commandStr)
     String message = "";
     int resultValue = -1;
 
+    switch (cmd.type)
+    {
+    case CommandType::SET:
+    case CommandType::GET:
+    case CommandType::TOGGLE:
+    case CommandType::PWM:
+        success = executePinCommand(cmd, message, resultValue);
+        break;
+
+    case CommandType::STATUS:
+        return generateStatusResponse();
+
+    case CommandType::RESET:
+        message = "System will restart in 2 seconds";
+        success = true;
+        // Note: Actual restart will be handled in main loop
+        break;
+
+    case CommandType::RESET_PINS:
+        success = _pinController.resetAllPins();
+        message = success ? "All pins reset to LOW" : "Failed to reset pins";
+        break;
+
+    case CommandType::SEQ:
+        success = runSequence(cmd.steps);
+        if (success)
+        {
+            message = "Sequence of " + String(cmd.steps.size()) + " steps executed";
+        }
+        else
+        {
+            message = "Failed to execute sequence";
+        }
+        break;
+
+    case CommandType::PWM_RAMP:
+        success = runPWMRamp(cmd);
+        message = success ? "PWM ramp complete" : "Failed to ramp PWM";
+        resultValue = _pinController.getPWM(cmd.pin);
+        break;
+
+    case CommandType::BATCH:
+        return runBatch(cmd);
+
+    case CommandType::HELP:
+        return _parser.getHelpText();
+
+    default:
+        message = "Unknown command";
+        success = false;
+        break;
+    }
+
+    return _parser.generateResponse(cmd, success, message, resultValue);
+}
+
+bool NetworkServer::executePinCommand(const Command &cmd, String &message, int &resultValue)
+{
+    bool success = false;
+
     switch (cmd.type)
     {
     case CommandType::SET:
@@ -202,30 +331,104 @@ String NetworkServer::processCommand(const String &commandStr)
         resultValue = cmd.value;
         break;
 
-    case CommandType::STATUS:
-        return generateStatusResponse();
-
-    case CommandType::RESET:
-        message = "System will restart in 2 seconds";
-        success = true;
-        // Note: Actual restart will be handled in main loop
+    default:
+        message = "Unknown command";
         break;
+    }
 
-    case CommandType::RESET_PINS:
-        success = _pinController.resetAllPins();
-        message = success ? "All pins reset to LOW" : "Failed to reset pins";
-        break;
+    return success;
+}
 
-    case CommandType::HELP:
-        return _parser.getHelpText();
+String NetworkServer::runBatch(const Command &cmd)
+{
+    JsonDocument doc;
+    doc["success"] = true;
+    doc["command"] = "BATCH";
+    JsonArray results = doc["results"].to<JsonArray>();
 
-    default:
-        message = "Unknown command";
-        success = false;
-        break;
+    // Every op runs, even after a failure; each gets its own result
+    bool allSucceeded = true;
+    for (const PinOp &op : cmd.ops)
+    {
+        Command opCmd;
+        opCmd.type = op.type;
+        opCmd.pin = op.pin;
+        opCmd.value = op.value;
+
+        String message = "";
+        int resultValue = -1;
+        bool success = executePinCommand(opCmd, message, resultValue);
+        if (!success)
+        {
+            allSucceeded = false;
+        }
+        results.add(serialized(_parser.generateResponse(opCmd, success, message, resultValue)));
     }
 
-    return _parser.generateResponse(cmd, success, message, resultValue);
+    doc["success"] = allSucceeded;
+    doc["message"] = String(cmd.ops.size()) + " ops executed";
+
+    String response;
+    serializeJson(doc, response);
+    return response;
+}
+
+bool NetworkServer::runSequence(const std::vector<SequenceStep> &steps)
+{
+    for (const SequenceStep &step : steps)
+    {
+        if (!_pinController.setDigital(step.pin, step.value))
+        {
+            return false;
+        }
+
+        if (step.delayMs > 0)
+        {
+            delayWithWatchdog(step.delayMs);
+        }
+    }
+    return true;
+}
+
+bool NetworkServer::runPWMRamp(const Command &cmd)
+{
+    int direction = (cmd.value >= cmd.rampFrom) ? 1 : -1;
+    int level = cmd.rampFrom;
+
+    while (true)
+    {
+        if (!_pinController.setPWM(cmd.pin, level))
+        {
+            return false;
+        }
+
+        if (level == cmd.value)
+        {
+            return true;
+        }
+
+        delayWithWatchdog(cmd.rampDelayMs);
+
+        // Always finish exactly on the target value
+        level += direction * cmd.rampStep;
+        if ((direction > 0 && level > cmd.value) || (direction < 0 && level < cmd.value))
+        {
+            level = cmd.value;
+        }
+    }
+}
+
+void NetworkServer::delayWithWatchdog(unsigned long ms)
+{
+    unsigned long start = millis();
+    unsigned long elapsed;
+
+    while ((elapsed = millis() - start) < ms)
+    {
+        unsigned long remaining = ms - elapsed;
+        delay(remaining < 50 ? remaining : 50);
+        watchdogManager.feed();
+    }
 }
 
 String NetworkServer::generateStatusResponse()
@@ -248,6 +451,7 @@ String NetworkServer::generateStatusResponse()
     wifi["ssid"] = wifiManager.getCurrentSSID();
     wifi["ip"] = wifiManager.getIPAddress();
     wifi["rssi"] = wifiManager.getSignalStrength();
+    wifi["mac"] = WiFi.macAddress();
 
     // Server info
     JsonObject server = doc["server"].to<JsonObject>();